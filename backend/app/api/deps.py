@@ -4,14 +4,28 @@ from fastapi import Depends, HTTPException, status, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 import time
 import logging
-from collections import defaultdict, deque
+from array import array
+from collections import OrderedDict
+from app.core.util import client_ip as get_client_ip
 
 logger = logging.getLogger(__name__)
 
+MAX_TRACKED_CLIENTS = 10000
+
+class TokenRing:
+    """Fixed-size ring of the last N request timestamps for one client"""
+    __slots__ = ('buf', 'head', 'n')
+    
+    def __init__(self, max_requests: int):
+        self.buf = array('d', [float('-inf')] * max_requests)
+        self.head = 0
+        self.n = max_requests
+
 # Simple in-memory rate limiter
 class RateLimiter:
-    def __init__(self):
-        self.requests = defaultdict(deque)
+    def __init__(self, max_clients: int = MAX_TRACKED_CLIENTS):
+        self.rings = OrderedDict()  # LRU of (client_ip, endpoint_type) -> TokenRing
+        self.max_clients = max_clients
         self.limits = {
             "scraping": {"max_requests": 10, "window": 60},  # 10 requests per minute
             "download": {"max_requests": 50, "window": 60},  # 50 downloads per minute
@@ -19,57 +33,56 @@ class RateLimiter:
         }
     
     def is_allowed(self, client_ip: str, endpoint_type: str = "default") -> bool:
-        now = time.time()
+        now = time.monotonic()
         limit_config = self.limits.get(endpoint_type, {"max_requests": 30, "window": 60})
         
-        # Clean old requests
-        client_requests = self.requests[client_ip]
-        while client_requests and client_requests[0] < now - limit_config["window"]:
-            client_requests.popleft()
+        key = (client_ip, endpoint_type)
+        ring = self.rings.get(key)
+        if ring is None:
+            ring = self.rings[key] = TokenRing(limit_config["max_requests"])
+            if len(self.rings) > self.max_clients:
+                self.rings.popitem(last=False)  # Reap the least recently seen client
+        else:
+            self.rings.move_to_end(key)
         
-        # Check if limit exceeded
-        if len(client_requests) >= limit_config["max_requests"]:
+        # The slot at head holds the oldest of the last N requests
+        head = ring.head
+        if now - ring.buf[head] < limit_config["window"]:
             return False
         
-        # Add current request
-        client_requests.append(now)
+        ring.buf[head] = now
+        ring.head = (head + 1) % ring.n
         return True
 
 rate_limiter = RateLimiter()
 
-def get_client_ip(request: Request) -> str:
-    """Extract client IP from request"""
-    forwarded = request.headers.get("X-Forwarded-For")
-    if forwarded:
-        return forwarded.split(",")[0].strip()
-    return request.client.host
-
-def check_rate_limit(endpoint_type: str = "default"):
-    """Rate limiting dependency"""
-    def rate_limit_dependency(request: Request):
-        client_ip = get_client_ip(request)
-        
-        if not rate_limiter.is_allowed(client_ip, endpoint_type):
-            logger.warning(f"Rate limit exceeded for {client_ip} on {endpoint_type}")
-            raise HTTPException(
-                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                detail="Rate limit exceeded. Please try again later."
-            )
-        
-        return True
+def _enforce(request: Request, endpoint_type: str) -> None:
+    """Raise 429 if the client has exceeded the limit for endpoint_type"""
+    client_ip = get_client_ip(request)
     
-    return rate_limit_dependency
+    if not rate_limiter.is_allowed(client_ip, endpoint_type):
+        logger.warning(f"Rate limit exceeded for {client_ip} on {endpoint_type}")
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Rate limit exceeded. Please try again later."
+        )
+
+# Rate limit dependencies are async so the check runs on the event loop,
+# not the threadpool (no lock needed)
 
 # Dependency for scraping endpoints
-def scraping_rate_limit(request: Request = Depends(check_rate_limit("scraping"))):
+async def scraping_rate_limit(request: Request):
+    _enforce(request, "scraping")
     return request
 
 # Dependency for download endpoints  
-def download_rate_limit(request: Request = Depends(check_rate_limit("download"))):
+async def download_rate_limit(request: Request):
+    _enforce(request, "download")
     return request
 
 # Dependency for validation endpoints
-def validation_rate_limit(request: Request = Depends(check_rate_limit("validation"))):
+async def validation_rate_limit(request: Request):
+    _enforce(request, "validation")
     return request
 
 # Optional authentication (for future use)
@@ -1,28 +1,45 @@
 # backend/app/api/endpoints/files.py
 from fastapi import APIRouter, HTTPException, Response
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, RedirectResponse
+import asyncio
+import csv
 import os
-import mimetypes
+import orjson
+import pandas as pd
+from app.core import artifact_index
+from app.models.response import PreviewResponse
+from app.models.scraping import trusted_response
+from app.core.util import model_response
 
 router = APIRouter()
 
 @router.get("/download/{scrape_id}/{file_type}")
-async def download_file(scrape_id: str, file_type: str):
-    """Download scraped data file"""
+async def download_file(scrape_id: str, file_type: str, attachment: bool = False):
+    """Download scraped data file
+    
+    Redirects to the static /downloads mount, which serves the bytes without
+    going through this handler and supports Range requests. Pass
+    attachment=true to stream it here with a Content-Disposition filename.
+    """
     if file_type not in ['csv', 'json']:
         raise HTTPException(status_code=400, detail="Invalid file type. Use 'csv' or 'json'")
     
     try:
         # Find the file
-        files = [f for f in os.listdir("data/processed") 
-                if f.startswith(f"scrape_{scrape_id}") and f.endswith(f".{file_type}")]
+        artifacts = artifact_index.get(scrape_id)
+        file_path = artifacts and (artifacts.csv_path if file_type == "csv" else artifacts.json_path)
         
-        if not files:
+        if not file_path:
             raise HTTPException(status_code=404, detail="File not found")
         
-        file_path = f"data/processed/{files[0]}"
+        if not attachment:
+            return RedirectResponse(
+                url=f"/downloads/processed/{os.path.basename(file_path)}",
+                status_code=307
+            )
         
-        if not os.path.exists(file_path):
+        if not os.path.isfile(file_path):
+            artifact_index.discard(scrape_id)
             raise HTTPException(status_code=404, detail="File not found")
         
         # Determine content type
@@ -33,58 +50,88 @@ async def download_file(scrape_id: str, file_type: str):
             media_type=content_type,
             filename=f"scraped_data_{scrape_id}.{file_type}"
         )
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Download failed: {str(e)}")
 
+def _count_records(artifacts) -> int:
+    """Total record count from the metadata sidecar, falling back to counting CSV rows"""
+    if artifacts.metadata_path:
+        try:
+            with open(artifacts.metadata_path, 'rb') as f:
+                return orjson.loads(f.read())['total_records']
+        except (OSError, ValueError, KeyError):
+            pass
+    
+    # Parse rather than count lines: scraped text can hold quoted newlines
+    with open(artifacts.csv_path, newline='', encoding='utf-8') as f:
+        return max(sum(1 for _ in csv.reader(f)) - 1, 0)
+
+def _load_preview(artifacts, limit: int):
+    """Blocking part of preview_data: parse the first rows and count the rest"""
+    # Only parse the rows we return
+    df = pd.read_csv(artifacts.csv_path, nrows=limit, engine='c')
+    return df, _count_records(artifacts)
+
 @router.get("/preview/{scrape_id}")
 async def preview_data(scrape_id: str, limit: int = 10):
     """Preview scraped data"""
     try:
-        import json
-        import pandas as pd
-        
         # Find CSV file
-        csv_files = [f for f in os.listdir("data/processed") 
-                    if f.startswith(f"scrape_{scrape_id}") and f.endswith(".csv")]
+        artifacts = artifact_index.get(scrape_id)
         
-        if not csv_files:
+        if not artifacts or not artifacts.csv_path:
             raise HTTPException(status_code=404, detail="Data not found")
         
-        df = pd.read_csv(f"data/processed/{csv_files[0]}")
-        preview_data = df.head(limit).to_dict('records')
+        try:
+            df, total_records = await asyncio.to_thread(_load_preview, artifacts, limit)
+        except FileNotFoundError:
+            # Deleted behind the index's back (cleanup, another worker)
+            artifact_index.discard(scrape_id)
+            raise HTTPException(status_code=404, detail="Data not found")
+        preview_data = df.to_dict('records')
         
-        return {
-            "total_records": len(df),
-            "columns": list(df.columns),
-            "preview": preview_data
-        }
+        return model_response(trusted_response(
+            PreviewResponse,
+            total_records=total_records,
+            columns=list(df.columns),
+            preview=preview_data
+        ))
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Preview failed: {str(e)}")
 
+def _delete_files(paths) -> list:
+    """Unlink each path, returning the basenames that were actually removed"""
+    deleted_files = []
+    for file_path in paths:
+        try:
+            os.unlink(file_path)
+        except FileNotFoundError:
+            continue
+        deleted_files.append(os.path.basename(file_path))
+    return deleted_files
+
 @router.delete("/data/{scrape_id}")
 async def delete_scraped_data(scrape_id: str):
     """Delete scraped data and associated files"""
     try:
-        import os
-        
         # Find all files for this scrape_id
-        files_to_delete = [f for f in os.listdir("data/processed") 
-                          if f.startswith(f"scrape_{scrape_id}")]
+        artifacts = artifact_index.remove(scrape_id)
         
-        if not files_to_delete:
+        if not artifacts:
             raise HTTPException(status_code=404, detail="Scrape data not found")
         
-        deleted_files = []
-        for file in files_to_delete:
-            file_path = f"data/processed/{file}"
-            if os.path.exists(file_path):
-                os.remove(file_path)
-                deleted_files.append(file)
+        deleted_files = await asyncio.to_thread(_delete_files, artifacts.paths())
         
         return {
             "message": f"Deleted {len(deleted_files)} files",
             "deleted_files": deleted_files
         }
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Deletion failed: {str(e)}")
     
\ No newline at end of file
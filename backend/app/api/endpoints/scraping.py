@@ -1,23 +1,38 @@
 # backend/app/api/endpoints/scraping.py
-from fastapi import APIRouter, HTTPException, BackgroundTasks, Query
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Query, Depends
 from typing import Optional, Dict, List
-from pydantic import BaseModel, HttpUrl
+from pydantic import BaseModel, field_validator
 from app.services.scraper import UniversalScraper
 from app.core.config import settings
+from app.core import artifact_index
+from app.models.response import HistoryResponse, ScrapeStatusResponse
+from app.models.scraping import trusted_response, validate_http_url
+from app.core.util import model_response
+from app.api.deps import validation_rate_limit
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
 import logging
+import orjson
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+# Long-lived pool for small blocking metadata reads
+_io_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="metadata-io")
+
 # Pydantic Models
 class UrlValidationRequest(BaseModel):
-    url: HttpUrl
+    url: str
+    
+    _validate_url = field_validator('url')(validate_http_url)
 
 class ScrapeRequest(BaseModel):
-    url: HttpUrl
+    url: str
     strategy: Optional[Dict] = None
     max_pages: Optional[int] = 10
     fields_config: Optional[Dict] = None
+    
+    _validate_url = field_validator('url')(validate_http_url)
 
 class ScrapeResponse(BaseModel):
     success: bool
@@ -44,7 +59,11 @@ class StrategyDetectionResponse(BaseModel):
     recommended_strategy: Optional[Dict] = None
     error: Optional[str] = None
 
-@router.post("/validate-url", response_model=ValidationResponse)
+# Responses below wrap data produced by the scraper itself, so they are built
+# with trusted_response() and serialized directly by model_response(),
+# skipping a redundant validation pass on the way in and on the way out
+
+@router.post("/validate-url", response_model=ValidationResponse, dependencies=[Depends(validation_rate_limit)])
 async def validate_url(request: UrlValidationRequest):
     """Validate if a URL is accessible and contains scrapable content"""
     try:
@@ -52,20 +71,22 @@ async def validate_url(request: UrlValidationRequest):
             result = await scraper.validate_url(str(request.url))
             
             if result['valid']:
-                return ValidationResponse(
+                return model_response(trusted_response(
+                    ValidationResponse,
                     valid=True,
                     message="URL is valid and contains scrapable content",
                     tables_found=result.get('tables_found'),
                     lists_found=result.get('lists_found'),
                     potential_sources=result.get('potential_sources'),
                     title=result.get('title')
-                )
+                ))
             else:
-                return ValidationResponse(
+                return model_response(trusted_response(
+                    ValidationResponse,
                     valid=False,
                     message="URL validation failed",
                     error=result.get('error')
-                )
+                ))
     except Exception as e:
         logger.error(f"URL validation error: {e}")
         raise HTTPException(status_code=500, detail=f"Validation failed: {str(e)}")
@@ -77,12 +98,13 @@ async def detect_data_structure(request: UrlValidationRequest):
         async with UniversalScraper() as scraper:
             result = await scraper.detect_data_structure(str(request.url))
             
-            return StrategyDetectionResponse(
+            return model_response(trusted_response(
+                StrategyDetectionResponse,
                 success=result['success'],
                 strategies=result.get('strategies', []),
                 recommended_strategy=result.get('recommended_strategy'),
                 error=result.get('error')
-            )
+            ))
     except Exception as e:
         logger.error(f"Structure detection error: {e}")
         raise HTTPException(status_code=500, detail=f"Detection failed: {str(e)}")
@@ -100,7 +122,8 @@ async def scrape_url(request: ScrapeRequest):
             )
             
             if result['success']:
-                return ScrapeResponse(
+                return model_response(trusted_response(
+                    ScrapeResponse,
                     success=True,
                     scrape_id=result['scrape_id'],
                     message="Scraping completed successfully",
@@ -108,71 +131,83 @@ async def scrape_url(request: ScrapeRequest):
                     columns=result['columns'],
                     preview=result['preview'],
                     files=result['files']
-                )
+                ))
             else:
-                return ScrapeResponse(
+                return model_response(trusted_response(
+                    ScrapeResponse,
                     success=False,
                     scrape_id=result['scrape_id'],
                     message="Scraping failed",
                     error=result['error']
-                )
+                ))
     except Exception as e:
         logger.error(f"Scraping error: {e}")
         raise HTTPException(status_code=500, detail=f"Scraping failed: {str(e)}")
 
+def _load_json(path: str) -> Dict:
+    """Read and parse a JSON file with orjson"""
+    with open(path, 'rb') as f:
+        return orjson.loads(f.read())
+
 @router.get("/scrape/{scrape_id}/status")
 async def get_scrape_status(scrape_id: str):
     """Get the status of a scraping job"""
     try:
-        import os
-        import json
-        
         # Find metadata file
-        metadata_files = [f for f in os.listdir("data/processed") 
-                         if f.startswith(f"scrape_{scrape_id}") and f.endswith("_metadata.json")]
+        artifacts = artifact_index.get(scrape_id)
         
-        if not metadata_files:
+        if not artifacts or not artifacts.metadata_path:
             raise HTTPException(status_code=404, detail="Scrape job not found")
         
-        with open(f"data/processed/{metadata_files[0]}", 'r') as f:
-            metadata = json.load(f)
+        try:
+            metadata = await asyncio.to_thread(_load_json, artifacts.metadata_path)
+        except FileNotFoundError:
+            artifact_index.discard(scrape_id)
+            raise HTTPException(status_code=404, detail="Scrape job not found")
         
-        return {
-            "scrape_id": scrape_id,
-            "status": "completed",
-            "metadata": metadata
-        }
+        return model_response(trusted_response(
+            ScrapeStatusResponse,
+            scrape_id=scrape_id,
+            status="completed",
+            metadata=metadata
+        ))
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Status check error: {e}")
         raise HTTPException(status_code=500, detail=f"Status check failed: {str(e)}")
 
+def _read_metadata(path: str) -> Optional[Dict]:
+    """Read and parse a metadata file, returning None if it can't be loaded"""
+    try:
+        return _load_json(path)
+    except (OSError, ValueError):
+        return None
+
 @router.get("/history")
 async def get_scrape_history(limit: int = Query(default=20, le=100)):
     """Get scraping history"""
     try:
-        import os
-        import json
-        from datetime import datetime
-        
-        metadata_files = [f for f in os.listdir("data/processed") 
-                         if f.endswith("_metadata.json")]
+        loop = asyncio.get_running_loop()
+        metadata_list = await asyncio.gather(*[
+            loop.run_in_executor(_io_pool, _read_metadata, artifacts.metadata_path)
+            for artifacts in artifact_index.history(limit)
+        ])
         
         history = []
-        for file in sorted(metadata_files, reverse=True)[:limit]:
+        for metadata in metadata_list:
             try:
-                with open(f"data/processed/{file}", 'r') as f:
-                    metadata = json.load(f)
-                    history.append({
-                        "scrape_id": metadata['scrape_id'],
-                        "url": metadata['url'],
-                        "timestamp": metadata['timestamp'],
-                        "total_records": metadata['total_records'],
-                        "columns": len(metadata['columns'])
-                    })
+                history.append({
+                    "scrape_id": metadata['scrape_id'],
+                    "url": metadata['url'],
+                    "timestamp": metadata['timestamp'],
+                    "total_records": metadata['total_records'],
+                    "columns": len(metadata['columns'])
+                })
             except Exception:
                 continue
         
-        return {"history": history}
+        return model_response(trusted_response(HistoryResponse, history=history))
     except Exception as e:
         logger.error(f"History fetch error: {e}")
         raise HTTPException(status_code=500, detail=f"History fetch failed: {str(e)}")
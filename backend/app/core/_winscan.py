@@ -0,0 +1,85 @@
+# backend/app/core/_winscan.py
+import fnmatch
+import os
+import sys
+from typing import Iterator, Optional, Tuple
+
+# scan() yields (name, is_dir, mtime). mtime is seconds since the epoch, or
+# None where the platform can't report it without an extra stat() call.
+
+if sys.platform == "win32":
+    import ctypes
+    from ctypes import wintypes
+
+    _FILE_ATTRIBUTE_DIRECTORY = 0x10
+    _ERROR_FILE_NOT_FOUND = 2
+    _ERROR_NO_MORE_FILES = 18
+    _INVALID_HANDLE_VALUE = wintypes.HANDLE(-1).value
+    _EPOCH_AS_FILETIME = 116444736000000000  # 1970-01-01 in 100ns ticks since 1601-01-01
+
+    class WIN32_FIND_DATAW(ctypes.Structure):
+        _fields_ = [
+            ("dwFileAttributes", wintypes.DWORD),
+            ("ftCreationTime", wintypes.FILETIME),
+            ("ftLastAccessTime", wintypes.FILETIME),
+            ("ftLastWriteTime", wintypes.FILETIME),
+            ("nFileSizeHigh", wintypes.DWORD),
+            ("nFileSizeLow", wintypes.DWORD),
+            ("dwReserved0", wintypes.DWORD),
+            ("dwReserved1", wintypes.DWORD),
+            ("cFileName", wintypes.WCHAR * 260),
+            ("cAlternateFileName", wintypes.WCHAR * 14),
+        ]
+
+    _kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+
+    _FindFirstFileW = _kernel32.FindFirstFileW
+    _FindFirstFileW.argtypes = [wintypes.LPCWSTR, ctypes.POINTER(WIN32_FIND_DATAW)]
+    _FindFirstFileW.restype = wintypes.HANDLE
+
+    _FindNextFileW = _kernel32.FindNextFileW
+    _FindNextFileW.argtypes = [wintypes.HANDLE, ctypes.POINTER(WIN32_FIND_DATAW)]
+    _FindNextFileW.restype = wintypes.BOOL
+
+    _FindClose = _kernel32.FindClose
+    _FindClose.argtypes = [wintypes.HANDLE]
+    _FindClose.restype = wintypes.BOOL
+
+    def scan(directory: str, pattern: str = "*") -> Iterator[Tuple[str, bool, Optional[float]]]:
+        """Enumerate directory entries matching pattern, filtered by the kernel"""
+        data = WIN32_FIND_DATAW()
+        handle = _FindFirstFileW(os.path.join(directory, pattern), ctypes.byref(data))
+        if handle == _INVALID_HANDLE_VALUE:
+            error = ctypes.get_last_error()
+            if error == _ERROR_FILE_NOT_FOUND:  # Directory exists but nothing matched
+                return
+            raise ctypes.WinError(error)
+
+        try:
+            while True:
+                name = data.cFileName
+                if name not in (".", ".."):
+                    ft = data.ftLastWriteTime
+                    mtime_100ns = (ft.dwHighDateTime << 32) | ft.dwLowDateTime
+                    yield (
+                        name,
+                        bool(data.dwFileAttributes & _FILE_ATTRIBUTE_DIRECTORY),
+                        (mtime_100ns - _EPOCH_AS_FILETIME) / 1e7
+                    )
+
+                if not _FindNextFileW(handle, ctypes.byref(data)):
+                    error = ctypes.get_last_error()
+                    if error == _ERROR_NO_MORE_FILES:
+                        break
+                    raise ctypes.WinError(error)
+        finally:
+            _FindClose(handle)
+
+else:
+    def scan(directory: str, pattern: str = "*") -> Iterator[Tuple[str, bool, Optional[float]]]:
+        """Enumerate directory entries matching pattern via os.scandir"""
+        with os.scandir(directory) as it:
+            for entry in it:
+                if fnmatch.fnmatchcase(entry.name, pattern):
+                    # d_type gives is_dir for free; mtime would cost a stat()
+                    yield entry.name, entry.is_dir(follow_symlinks=False), None
@@ -0,0 +1,127 @@
+# backend/app/core/artifact_index.py
+import heapq
+import os
+import threading
+import time
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from app.core import _winscan
+
+PROCESSED_DIR = "data/processed"
+
+class ScrapeArtifacts(NamedTuple):
+    """Files produced by a single scrape"""
+    csv_path: Optional[str] = None
+    json_path: Optional[str] = None
+    metadata_path: Optional[str] = None
+    mtime: float = 0.0
+    # Every scrape_{id}_* file on disk, including extra exports and duplicates
+    other_paths: Tuple[str, ...] = ()
+
+    def paths(self) -> List[str]:
+        known = [p for p in (self.csv_path, self.json_path, self.metadata_path) if p]
+        return known + [p for p in self.other_paths if p not in known]
+
+_lock = threading.Lock()
+_artifacts: Dict[str, ScrapeArtifacts] = {}
+_dir_mtime_ns: Optional[int] = None
+
+# Filename parsing shared with FileManager, so both agree on what a scrape file is
+
+def scrape_id_from_filename(filename: str) -> Optional[str]:
+    """Extract the scrape ID from a 'scrape_{id}_{timestamp}...' filename"""
+    if not filename.startswith("scrape_"):
+        return None
+    scrape_id, sep, _ = filename[len("scrape_"):].partition("_")
+    return scrape_id if sep and scrape_id else None
+
+def file_kind(filename: str) -> Optional[str]:
+    """Classify a scrape file as 'metadata', 'csv' or 'json'; None for anything else"""
+    if filename.endswith("_metadata.json"):
+        return "metadata"
+    if filename.endswith(".csv"):
+        return "csv"
+    if filename.endswith(".json"):
+        return "json"
+    return None
+
+def _scan() -> Dict[str, ScrapeArtifacts]:
+    """Group the processed directory by scrape ID in a single pass"""
+    found = {}
+    for name, is_dir, mtime in _winscan.scan(PROCESSED_DIR, "scrape_*"):
+        scrape_id = scrape_id_from_filename(name)
+        if is_dir or not scrape_id:
+            continue
+
+        path = os.path.join(PROCESSED_DIR, name)
+        artifacts = found.get(scrape_id, ScrapeArtifacts())
+        artifacts = artifacts._replace(other_paths=artifacts.other_paths + (path,))
+        kind = file_kind(name)
+        if kind == "metadata":
+            if mtime is None:
+                mtime = os.stat(path).st_mtime
+            artifacts = artifacts._replace(metadata_path=path, mtime=mtime)
+        elif kind == "csv":
+            artifacts = artifacts._replace(csv_path=path)
+        elif kind == "json":
+            artifacts = artifacts._replace(json_path=path)
+        found[scrape_id] = artifacts
+    return found
+
+def rebuild() -> None:
+    """(Re)build the index from the processed directory"""
+    global _dir_mtime_ns
+    with _lock:
+        try:
+            mtime_ns = os.stat(PROCESSED_DIR).st_mtime_ns
+            found = _scan()
+        except FileNotFoundError:
+            mtime_ns, found = None, {}
+        _artifacts.clear()
+        _artifacts.update(found)
+        _dir_mtime_ns = mtime_ns
+
+def _refresh_if_changed() -> None:
+    """Rebuild when another process has written to the processed directory"""
+    try:
+        mtime_ns = os.stat(PROCESSED_DIR).st_mtime_ns
+    except FileNotFoundError:
+        return
+    if mtime_ns != _dir_mtime_ns:
+        rebuild()
+
+def register(scrape_id: str, paths: Dict[str, str]) -> None:
+    """Record the files written by a finished scrape"""
+    with _lock:
+        _artifacts[scrape_id] = ScrapeArtifacts(
+            csv_path=paths.get("csv"),
+            json_path=paths.get("json"),
+            metadata_path=paths.get("metadata"),
+            mtime=time.time()
+        )
+
+def get(scrape_id: str) -> Optional[ScrapeArtifacts]:
+    """Look up the artifacts for a scrape ID"""
+    artifacts = _artifacts.get(scrape_id)
+    if artifacts is None:
+        _refresh_if_changed()
+        artifacts = _artifacts.get(scrape_id)
+    return artifacts
+
+def remove(scrape_id: str) -> Optional[ScrapeArtifacts]:
+    """Drop a scrape from the index and return its artifacts"""
+    artifacts = get(scrape_id)
+    with _lock:
+        _artifacts.pop(scrape_id, None)
+    return artifacts
+
+def discard(scrape_id: str) -> None:
+    """Forget a scrape whose files turned out to be gone, e.g. deleted by another worker"""
+    with _lock:
+        _artifacts.pop(scrape_id, None)
+
+def history(limit: int) -> List[ScrapeArtifacts]:
+    """Return the newest scrapes that have metadata, newest first"""
+    _refresh_if_changed()
+    with _lock:
+        candidates = [a for a in _artifacts.values() if a.metadata_path]
+    return heapq.nlargest(limit, candidates, key=lambda a: a.mtime)
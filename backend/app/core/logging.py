@@ -12,6 +12,7 @@ def setup_logging():
     
     # Get log level from environment
     log_level = os.getenv("LOG_LEVEL", "INFO").upper()
+    today = datetime.now().strftime('%Y%m%d')
     
     logging_config = {
         "version": 1,
@@ -41,7 +42,7 @@ def setup_logging():
                 "class": "logging.handlers.RotatingFileHandler",
                 "level": log_level,
                 "formatter": "detailed",
-                "filename": f"logs/scrapeease_{datetime.now().strftime('%Y%m%d')}.log",
+                "filename": f"logs/scrapeease_{today}.log",
                 "maxBytes": 10485760,  # 10MB
                 "backupCount": 5,
                 "encoding": "utf8"
@@ -50,7 +51,7 @@ def setup_logging():
                 "class": "logging.handlers.RotatingFileHandler",
                 "level": "ERROR",
                 "formatter": "detailed", 
-                "filename": f"logs/scrapeease_errors_{datetime.now().strftime('%Y%m%d')}.log",
+                "filename": f"logs/scrapeease_errors_{today}.log",
                 "maxBytes": 10485760,  # 10MB
                 "backupCount": 5,
                 "encoding": "utf8"
@@ -116,30 +117,27 @@ class RequestLogger:
     
     def log_request(self, method: str, url: str, client_ip: str, status_code: int = None, duration: float = None):
         """Log HTTP request details"""
-        message = f"{method} {url} from {client_ip}"
+        level = logging.ERROR if status_code and status_code >= 400 else logging.INFO
+        if not self.logger.isEnabledFor(level):
+            return
         
+        # Deferred %-formatting: the message is only built if a handler emits it
         if status_code:
-            message += f" -> {status_code}"
-        
-        if duration:
-            message += f" ({duration:.3f}s)"
-        
-        if status_code and status_code >= 400:
-            self.logger.error(message)
+            self.logger.log(level, "%s %s from %s -> %s (%.3fs)", method, url, client_ip, status_code, duration or 0.0)
         else:
-            self.logger.info(message)
+            self.logger.log(level, "%s %s from %s", method, url, client_ip)
     
     def log_scraping_start(self, scrape_id: str, url: str, strategy: str):
         """Log scraping operation start"""
-        self.logger.info(f"Scraping started - ID: {scrape_id}, URL: {url}, Strategy: {strategy}")
+        self.logger.info("Scraping started - ID: %s, URL: %s, Strategy: %s", scrape_id, url, strategy)
     
     def log_scraping_complete(self, scrape_id: str, records: int, duration: float):
         """Log scraping operation completion"""
-        self.logger.info(f"Scraping completed - ID: {scrape_id}, Records: {records}, Duration: {duration:.2f}s")
+        self.logger.info("Scraping completed - ID: %s, Records: %s, Duration: %.2fs", scrape_id, records, duration)
     
     def log_scraping_error(self, scrape_id: str, error: str):
         """Log scraping operation error"""
-        self.logger.error(f"Scraping failed - ID: {scrape_id}, Error: {error}")
+        self.logger.error("Scraping failed - ID: %s, Error: %s", scrape_id, error)
 
 # Global request logger instance
 request_logger = RequestLogger()
\ No newline at end of file
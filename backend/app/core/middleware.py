@@ -1,107 +1,101 @@
 # backend/app/core/middleware.py
+import itertools
+import os
 import time
 import logging
-from typing import Callable
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from app.core.logging import request_logger
+from app.core.util import parse_forwarded_for
 
 logger = logging.getLogger(__name__)
 
-class LoggingMiddleware(BaseHTTPMiddleware):
-    """Middleware to log all HTTP requests and responses"""
-    
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        start_time = time.time()
-        
-        # Get client IP
-        client_ip = request.headers.get("X-Forwarded-For", "").split(",")[0].strip()
-        if not client_ip:
-            client_ip = request.client.host
-        
-        # Process request
-        try:
-            response = await call_next(request)
-            duration = time.time() - start_time
-            
-            # Log request
-            request_logger.log_request(
-                method=request.method,
-                url=str(request.url),
-                client_ip=client_ip,
-                status_code=response.status_code,
-                duration=duration
-            )
-            
-            # Add response headers
-            response.headers["X-Process-Time"] = str(duration)
-            response.headers["X-Request-ID"] = getattr(request.state, "request_id", "unknown")
-            
-            return response
-            
-        except Exception as e:
-            duration = time.time() - start_time
-            logger.error(f"Request failed: {request.method} {request.url} - {str(e)}")
-            
-            return JSONResponse(
-                status_code=500,
-                content={"detail": "Internal server error"},
-                headers={
-                    "X-Process-Time": str(duration),
-                    "X-Error": "true"
-                }
-            )
+# Request IDs only need to be unique, not unpredictable: a per-process prefix
+# plus a counter (next() on itertools.count is atomic in CPython). The pid alone
+# repeats across container restarts and replicas (often pid 1), so the prefix
+# also carries the process start time and a few random bytes
+_request_counter = itertools.count()
+_request_id_prefix = f"{os.getpid():x}-{int(time.time()):x}{os.urandom(2).hex()}-"
+
+class UnifiedMiddleware:
+    """Single ASGI middleware for request IDs, logging, security headers and error handling"""
+
+    SECURITY_HEADERS = [
+        (b"x-content-type-options", b"nosniff"),
+        (b"x-frame-options", b"DENY"),
+        (b"x-xss-protection", b"1; mode=block"),
+        (b"referrer-policy", b"strict-origin-when-cross-origin"),
+        (b"permissions-policy", b"geolocation=(), microphone=(), camera=()"),
+    ]
+    CSP_HEADER = (b"content-security-policy", b"default-src 'self'")
+
+    # Swagger UI / ReDoc load their assets from a CDN, which default-src 'self' would block
+    CSP_EXEMPT_PATHS = frozenset({"/docs", "/docs/oauth2-redirect", "/redoc"})
 
-class SecurityMiddleware(BaseHTTPMiddleware):
-    """Middleware for security headers and basic protection"""
-    
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        response = await call_next(request)
-        
-        # Add security headers
-        security_headers = {
-            "X-Content-Type-Options": "nosniff",
-            "X-Frame-Options": "DENY",
-            "X-XSS-Protection": "1; mode=block",
-            "Referrer-Policy": "strict-origin-when-cross-origin",
-            "Content-Security-Policy": "default-src 'self'",
-            "Permissions-Policy": "geolocation=(), microphone=(), camera=()"
-        }
-        
-        for header, value in security_headers.items():
-            response.headers[header] = value
-        
-        return response
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+        request_id = _request_id_prefix + format(next(_request_counter), 'x')
+        client_ip = self._client_ip(scope)
+
+        state = scope.setdefault("state", {})
+        state["request_id"] = request_id
+        state["client_ip"] = client_ip
+
+        status_code = None
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = list(message.get("headers", ()))
+                headers.extend(self.SECURITY_HEADERS)
+                if scope["path"] not in self.CSP_EXEMPT_PATHS:
+                    headers.append(self.CSP_HEADER)
+                headers.append((b"x-request-id", request_id.encode()))
+                headers.append((b"x-process-time", str(time.perf_counter() - start_time).encode()))
+                message["headers"] = headers
+            await send(message)
 
-class ErrorHandlingMiddleware(BaseHTTPMiddleware):
-    """Global error handling middleware"""
-    
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
         try:
-            return await call_next(request)
+            await self.app(scope, receive, send_wrapper)
         except Exception as e:
-            logger.error(f"Unhandled error in {request.method} {request.url}: {str(e)}", exc_info=True)
-            
-            return JSONResponse(
+            logger.error(f"Unhandled error in {scope['method']} {scope['path']}: {str(e)}", exc_info=True)
+            if status_code is not None:
+                raise  # Response already started; nothing sensible left to send
+
+            response = JSONResponse(
                 status_code=500,
                 content={
                     "error": "Internal server error",
                     "message": "An unexpected error occurred",
                     "type": "server_error"
-                }
+                },
+                headers={"X-Error": "true"}
+            )
+            await response(scope, receive, send_wrapper)
+        finally:
+            request_logger.log_request(
+                method=scope["method"],
+                url=scope["path"],
+                client_ip=client_ip,
+                status_code=status_code,
+                duration=time.perf_counter() - start_time
             )
 
-class RequestIDMiddleware(BaseHTTPMiddleware):
-    """Middleware to add unique request IDs"""
-    
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        import uuid
-        request_id = str(uuid.uuid4())
-        request.state.request_id = request_id
-        
-        response = await call_next(request)
-        response.headers["X-Request-ID"] = request_id
-        
-        return response
-    
\ No newline at end of file
+    @staticmethod
+    def _client_ip(scope: Scope) -> str:
+        for name, value in scope["headers"]:
+            if name == b"x-forwarded-for":
+                client_ip = parse_forwarded_for(value.decode("latin-1"))
+                if client_ip:
+                    return client_ip
+                break
+        client = scope.get("client")
+        return client[0] if client else "unknown"
@@ -0,0 +1,28 @@
+# backend/app/core/util.py
+from typing import Optional
+from fastapi import Request, Response
+from pydantic import BaseModel
+
+def parse_forwarded_for(forwarded: Optional[str]) -> Optional[str]:
+    """Return the originating client from an X-Forwarded-For header value"""
+    if not forwarded:
+        return None
+    head, _, _ = forwarded.partition(",")
+    return head.strip() or None
+
+def client_ip(request: Request) -> str:
+    """Client IP for a request, preferring the value cached by the middleware"""
+    cached = getattr(request.state, "client_ip", None)
+    if cached:
+        return cached
+    return parse_forwarded_for(request.headers.get("X-Forwarded-For")) or request.client.host
+
+def model_response(model: BaseModel, status_code: int = 200) -> Response:
+    """Serialize a response model straight to a JSON response"""
+    # Returning a Response skips FastAPI's response_model re-validation and
+    # jsonable_encoder walk; pydantic-core encodes the model in one Rust call
+    return Response(
+        content=model.model_dump_json(),
+        status_code=status_code,
+        media_type="application/json"
+    )
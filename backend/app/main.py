@@ -1,14 +1,19 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from app.core.config import settings
+from app.core import artifact_index
+from app.core.middleware import UnifiedMiddleware
+from app.services.scraper import open_shared_connector, close_shared_connector
 import os
 from app.api.endpoints import scraping_router, files_router
 
 app = FastAPI(
     title="ScrapeEase API",
     description="Web Scraping Platform - Extract tabular data from URLs",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 app.add_middleware(
@@ -18,13 +23,26 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(UnifiedMiddleware)
 
 os.makedirs("data", exist_ok=True)
-app.mount("/downloads", StaticFiles(directory="data"), name="downloads")
+app.mount("/downloads", StaticFiles(directory="data", html=False), name="downloads")
 
 app.include_router(scraping_router, prefix="/api/v1", tags=["scraping"])
 app.include_router(files_router, prefix="/api/v1", tags=["files"])
 
+@app.on_event("startup")
+async def build_artifact_index():
+    artifact_index.rebuild()
+
+@app.on_event("startup")
+async def open_http_pool():
+    await open_shared_connector()
+
+@app.on_event("shutdown")
+async def close_http_pool():
+    await close_shared_connector()
+
 @app.get("/")
 async def root():
     return {"message": "Welcome to ScrapeEase API", "version": "1.0.0"}
@@ -1,8 +1,21 @@
 # backend/app/models/scraping.py
-from pydantic import BaseModel, HttpUrl, Field, validator
-from typing import Optional, Dict, List, Any, Union
+from pydantic import BaseModel, Field, field_validator, validator
+from typing import Optional, Dict, List, Any, Union, Tuple, Type, TypeVar, get_args
 from datetime import datetime
 from enum import Enum
+from functools import lru_cache
+import re
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+# Cheap shape check for incoming URLs; the scraper's own fetch is the real test
+_URL_RE = re.compile(r'^https?://[^\s/$.?#][^\s]*$', re.IGNORECASE)
+
+def validate_http_url(value: str) -> str:
+    """Reject anything that isn't an absolute http(s) URL"""
+    if not _URL_RE.match(value):
+        raise ValueError('URL must be an absolute http or https URL')
+    return value
 
 class ScrapeStatus(str, Enum):
     PENDING = "pending"
@@ -24,9 +37,11 @@ class ExportFormat(str, Enum):
 
 # Request Models
 class UrlValidationRequest(BaseModel):
-    url: HttpUrl
+    url: str
     check_robots: Optional[bool] = True
     
+    _validate_url = field_validator('url')(validate_http_url)
+    
     class Config:
         schema_extra = {
             "example": {
@@ -76,13 +91,15 @@ class ScrapingStrategy(BaseModel):
         }
 
 class ScrapeRequest(BaseModel):
-    url: HttpUrl
+    url: str
     strategy: Optional[ScrapingStrategy] = None
     max_pages: Optional[int] = Field(10, ge=1, le=100, description="Maximum pages to scrape")
     fields_config: Optional[Dict[str, FieldConfig]] = None
     export_formats: Optional[List[ExportFormat]] = Field(default_factory=lambda: [ExportFormat.CSV, ExportFormat.JSON])
     filters: Optional[Dict[str, Any]] = Field(None, description="Data filtering options")
     
+    _validate_url = field_validator('url')(validate_http_url)
+    
     @validator('max_pages')
     def validate_max_pages(cls, v):
         if v > 100:
@@ -280,4 +297,24 @@ class DeleteResponse(BaseModel):
                 "space_freed": 1048576
             }
         }
-        
\ No newline at end of file
+        
+
+@lru_cache(maxsize=None)
+def _enum_fields(cls: Type[BaseModel]) -> Tuple[Tuple[str, Type[Enum]], ...]:
+    """Fields of a model annotated with an Enum (or Optional[Enum])"""
+    found = []
+    for name, field in cls.model_fields.items():
+        for tp in (field.annotation, *get_args(field.annotation)):
+            if isinstance(tp, type) and issubclass(tp, Enum):
+                found.append((name, tp))
+                break
+    return tuple(found)
+
+def trusted_response(cls: Type[ModelT], **kw: Any) -> ModelT:
+    """Build a response model from backend-produced data without validation"""
+    # model_construct does no coercion, so enum fields must already be members
+    for name, enum_type in _enum_fields(cls):
+        value = kw.get(name)
+        if value is not None and not isinstance(value, enum_type):
+            kw[name] = enum_type(value)
+    return cls.model_construct(_fields_set=set(kw), **kw)
@@ -1,13 +1,166 @@
 # backend/app/services/data_processor.py
 import pandas as pd
-import json
+import orjson
 import os
-from typing import List, Dict, Any, Optional
-from datetime import datetime
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Any, Optional, Tuple, Union
 import logging
 
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    from pyarrow import csv as pacsv
+except ImportError:  # Fall back to pandas' writer and string ops
+    pa = None
+
+try:
+    import xlsxwriter
+except ImportError:  # Fall back to openpyxl
+    xlsxwriter = None
+
 logger = logging.getLogger(__name__)
 
+# Everything that isn't part of a number (currency symbols, thousands separators, units)
+_NUM_CLEAN_RE = re.compile(r'[^\d.-]')
+_EMPTY_VALUES = {'', 'None', 'nan'}
+
+# Column-name fragments that mark numeric and URL columns
+_NUMERIC_INDICATORS = ('price', 'cost', 'amount', 'value', 'rating', 'score', 'number', 'count')
+_URL_INDICATORS = ('url', 'link')
+
+def _clean_text_column(series: pd.Series) -> pd.Series:
+    """Strip whitespace and turn empty markers into missing values"""
+    if pa is not None:
+        try:
+            arr = pa.array(series, from_pandas=True)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            arr = None  # Mixed types; stringify them with pandas below
+        if arr is not None and pa.types.is_string(arr.type):
+            trimmed = pc.utf8_trim_whitespace(arr)
+            cleaned = pc.if_else(
+                pc.is_in(trimmed, value_set=pa.array(list(_EMPTY_VALUES))),
+                pa.scalar(None, pa.string()),
+                trimmed
+            )
+            # Back to plain object dtype: downstream str ops use compiled regexes,
+            # which Arrow-backed strings don't support, and pd.NA doesn't serialize
+            return pd.Series(cleaned.to_numpy(zero_copy_only=False), index=series.index, name=series.name)
+    
+    stripped = series.astype(str).str.strip()
+    return stripped.mask(stripped.isin(_EMPTY_VALUES))
+
+def _frame_from_records(raw_data: List[Dict[str, Any]]) -> pd.DataFrame:
+    """Build a DataFrame from scraped records, keeping string columns Arrow-backed"""
+    if pa is not None:
+        try:
+            # pa.array infers the struct over every record, so keys missing from the first
+            # row survive; it orders fields by name, so restore first-seen column order
+            table = pa.Table.from_struct_array(pa.array(raw_data))
+            table = table.select(list(dict.fromkeys(key for record in raw_data for key in record)))
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            table = None  # Mixed value types under one key; let pandas build object columns
+        if table is not None and table.num_columns:
+            # Only strings go to ArrowDtype: _clean_text_column reads them zero-copy and
+            # hands back object columns, so no Arrow dtypes leak past clean_data
+            return table.to_pandas(types_mapper=lambda t: pd.ArrowDtype(t) if pa.types.is_string(t) else None)
+    return pd.DataFrame(raw_data)
+
+_stamp_lock = threading.Lock()
+_last_stamp = 0
+
+def _file_stamp() -> str:
+    """Sortable stamp for export filenames, unique within the process"""
+    global _last_stamp
+    with _stamp_lock:
+        # Two saves in the same second used to overwrite each other's files
+        _last_stamp = max(time.time_ns(), _last_stamp + 1)
+        return f"{_last_stamp:x}"
+
+# Rows converted to dicts at a time when writing JSON, bounding peak memory
+_JSON_CHUNK_ROWS = 10_000
+
+def _json_default(value: Any) -> Any:
+    """orjson fallback for values it can't serialize natively"""
+    if value is pd.NaT:
+        return None
+    if isinstance(value, pd.Timestamp):
+        return value.isoformat()
+    return str(value)
+
+def write_json_records(df: pd.DataFrame, path: str) -> None:
+    """Stream a DataFrame to path as a JSON array of records, one record per line"""
+    with open(path, 'wb') as f:
+        f.write(b'[')
+        separator = b'\n  '
+        for start in range(0, len(df), _JSON_CHUNK_ROWS):
+            for record in df.iloc[start:start + _JSON_CHUNK_ROWS].to_dict(orient='records'):
+                f.write(separator)
+                f.write(orjson.dumps(record, default=_json_default, option=orjson.OPT_NON_STR_KEYS))
+                separator = b',\n  '
+        f.write(b'\n]' if len(df) else b']')
+
+def write_csv(df: pd.DataFrame, path: str) -> None:
+    """Write a DataFrame as CSV, using Arrow's multithreaded writer when available
+
+    Arrow quotes every string field (including headers), which any CSV reader
+    parses the same as pandas' minimal quoting. Bools and datetimes are rendered
+    up front so they read True/False and 2023-01-01 12:30:00 as they did under
+    pandas, rather than Arrow's true/false and nanosecond timestamps.
+    """
+    if pa is not None:
+        rendered = {
+            col: df[col].astype(str).where(df[col].notna(), None)
+            for col, dtype in df.dtypes.items()
+            if pd.api.types.is_bool_dtype(dtype) or pd.api.types.is_datetime64_any_dtype(dtype)
+        }
+        if rendered:
+            df = df.copy(deep=False)
+            for col, values in rendered.items():
+                df[col] = values
+        try:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            pacsv.write_csv(table, path, write_options=pacsv.WriteOptions(include_header=True))
+            return
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError) as e:
+            # Mixed-type object columns can't be converted; pandas handles them
+            logger.debug(f"Arrow CSV writer unavailable for {path}: {e}")
+    df.to_csv(path, index=False, encoding='utf-8')
+
+def _write_excel(df: pd.DataFrame, path: str) -> None:
+    """Write a DataFrame as a single-sheet workbook, streaming rows when xlsxwriter is available"""
+    if xlsxwriter is None:
+        df.to_excel(path, index=False, engine='openpyxl')
+        return
+
+    # constant_memory flushes each row to disk as soon as the next one starts,
+    # so rows must be written strictly in order and can't be formatted afterwards.
+    # pandas' to_excel writes column by column, hence the explicit row loop.
+    cells = df.astype(object).where(df.notna(), None)
+    # nan_inf_to_errors: ±inf would otherwise raise in write_number (openpyxl wrote them)
+    with xlsxwriter.Workbook(path, {'constant_memory': True, 'nan_inf_to_errors': True}) as workbook:
+        worksheet = workbook.add_worksheet()
+        datetime_format = workbook.add_format({'num_format': 'yyyy-mm-dd hh:mm:ss'})
+        for col_idx, dtype in enumerate(df.dtypes):
+            if pd.api.types.is_datetime64_any_dtype(dtype):
+                worksheet.set_column(col_idx, col_idx, 19, datetime_format)
+        worksheet.write_row(0, 0, [str(col) for col in df.columns])
+        for row_idx, row in enumerate(cells.itertuples(index=False, name=None), start=1):
+            worksheet.write_row(row_idx, 0, row)
+
+# format -> (file suffix, writer, label for logs), in the order files are reported
+_EXPORTERS = {
+    'csv': ('.csv', write_csv, 'CSV'),
+    'json': ('.json', write_json_records, 'JSON'),
+    'excel': ('.xlsx', _write_excel, 'Excel'),
+}
+
+# Export writers spend most of their time in C code or file IO with the GIL
+# released, so the formats of one save can be written side by side
+_export_pool = ThreadPoolExecutor(max_workers=len(_EXPORTERS), thread_name_prefix="export")
+
 class DataProcessor:
     """Handle data cleaning, validation, and export operations"""
     
@@ -20,43 +173,70 @@ class DataProcessor:
         os.makedirs(self.raw_dir, exist_ok=True)
         os.makedirs(self.processed_dir, exist_ok=True)
     
-    def clean_data(self, raw_data: List[Dict[str, Any]]) -> pd.DataFrame:
-        """Clean and standardize scraped data"""
-        if not raw_data:
-            return pd.DataFrame()
-        
-        df = pd.DataFrame(raw_data)
+    def clean_data(
+        self, raw_data: Union[List[Dict[str, Any]], pd.DataFrame], return_stats: bool = False
+    ) -> Union[pd.DataFrame, Tuple[pd.DataFrame, Dict[str, int]]]:
+        """Clean and standardize scraped data, optionally with stats for validate_data"""
+        if isinstance(raw_data, pd.DataFrame):
+            df = raw_data
+        elif raw_data:
+            df = _frame_from_records(raw_data)
+        else:
+            df = pd.DataFrame()
+            return (df, {'duplicates_removed': 0, 'duplicate_rows': 0, 'empty_cells': 0}) if return_stats else df
         
         # Remove completely empty rows
         df = df.dropna(how='all')
         
         # Clean text data
-        for col in df.select_dtypes(include=['object']).columns:
-            df[col] = df[col].astype(str).str.strip()
-            df[col] = df[col].replace(['', 'None', 'nan'], None)
-        
-        # Try to convert numeric columns
-        numeric_indicators = ['price', 'cost', 'amount', 'value', 'rating', 'score', 'number', 'count']
-        for col in df.columns:
-            if any(indicator in col.lower() for indicator in numeric_indicators):
-                # Remove currency symbols and convert to numeric
-                df[col] = pd.to_numeric(
-                    df[col].astype(str).str.replace(r'[^\d.-]', '', regex=True), 
-                    errors='ignore'
-                )
+        text_cols = [
+            col for col, dtype in df.dtypes.items()
+            if dtype == object or (isinstance(dtype, pd.ArrowDtype) and pa.types.is_string(dtype.pyarrow_dtype))
+        ]
+        for col in text_cols:
+            df[col] = _clean_text_column(df[col])
+        
+        # Try to convert numeric columns; already-numeric ones need no cleaning
+        lowers = {col: str(col).lower() for col in df.columns}
+        num_cols = [
+            col for col, lower in lowers.items()
+            if df[col].dtype == object and any(indicator in lower for indicator in _NUMERIC_INDICATORS)
+        ]
+        for col in num_cols:
+            # Remove currency symbols and convert to numeric
+            df[col] = pd.to_numeric(
+                df[col].str.replace(_NUM_CLEAN_RE, '', regex=True),
+                errors='ignore'
+            )
         
         # Clean URLs
-        url_columns = [col for col in df.columns if 'url' in col.lower() or 'link' in col.lower()]
+        url_columns = [
+            col for col, lower in lowers.items()
+            if any(indicator in lower for indicator in _URL_INDICATORS)
+        ]
         for col in url_columns:
-            df[col] = df[col].apply(self._clean_url)
+            # Same rules as _clean_url, applied column-wide instead of per cell
+            urls = df[col].astype(str).str.strip()
+            df[col] = urls.where(urls.str.startswith(('http://', 'https://')), None)
         
-        # Remove duplicate rows
-        df = df.drop_duplicates()
+        # Remove duplicate rows, hashing each row only once
+        dup_mask = df.duplicated()
+        n_dups = int(dup_mask.sum())
+        if n_dups:
+            df = df.loc[~dup_mask]
         
-        return df
+        if not return_stats:
+            return df
+        
+        # The returned frame has no duplicates left by construction
+        return df, {
+            'duplicates_removed': n_dups,
+            'duplicate_rows': 0,
+            'empty_cells': int(df.isna().to_numpy().sum())
+        }
     
     def _clean_url(self, url: str) -> Optional[str]:
-        """Clean and validate URLs"""
+        """Clean and validate a single URL"""
         if pd.isna(url) or not url:
             return None
         
@@ -66,8 +246,8 @@ class DataProcessor:
         
         return url
     
-    def validate_data(self, df: pd.DataFrame) -> Dict[str, Any]:
-        """Validate cleaned data and return quality metrics"""
+    def validate_data(self, df: pd.DataFrame, stats: Optional[Dict[str, int]] = None) -> Dict[str, Any]:
+        """Validate cleaned data and return quality metrics, reusing stats from clean_data if given"""
         if df.empty:
             return {
                 "valid": False,
@@ -78,8 +258,8 @@ class DataProcessor:
         metrics = {
             "total_rows": len(df),
             "total_columns": len(df.columns),
-            "empty_cells": df.isnull().sum().sum(),
-            "duplicate_rows": df.duplicated().sum(),
+            "empty_cells": stats['empty_cells'] if stats else int(df.isna().to_numpy().sum()),
+            "duplicate_rows": stats['duplicate_rows'] if stats else int(df.duplicated().sum()),
             "data_types": df.dtypes.to_dict(),
             "memory_usage": df.memory_usage(deep=True).sum()
         }
@@ -99,34 +279,33 @@ class DataProcessor:
         if formats is None:
             formats = ['csv', 'json']
         
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        timestamp = _file_stamp()
         base_filename = f"scrape_{scrape_id}_{timestamp}"
         
-        saved_files = {}
+        jobs = {
+            fmt: os.path.join(self.processed_dir, f"{base_filename}{suffix}")
+            for fmt, (suffix, _, _) in _EXPORTERS.items() if fmt in formats
+        }
         
         try:
-            # Save CSV
-            if 'csv' in formats:
-                csv_path = os.path.join(self.processed_dir, f"{base_filename}.csv")
-                df.to_csv(csv_path, index=False, encoding='utf-8')
-                saved_files['csv'] = csv_path
-                logger.info(f"Saved CSV: {csv_path}")
-            
-            # Save JSON
-            if 'json' in formats:
-                json_path = os.path.join(self.processed_dir, f"{base_filename}.json")
-                df.to_json(json_path, orient='records', indent=2, force_ascii=False)
-                saved_files['json'] = json_path
-                logger.info(f"Saved JSON: {json_path}")
-            
-            # Save Excel (optional)
-            if 'excel' in formats:
-                excel_path = os.path.join(self.processed_dir, f"{base_filename}.xlsx")
-                df.to_excel(excel_path, index=False, engine='openpyxl')
-                saved_files['excel'] = excel_path
-                logger.info(f"Saved Excel: {excel_path}")
+            if len(jobs) == 1:
+                # Nothing to overlap; skip the thread hop
+                for fmt, path in jobs.items():
+                    _EXPORTERS[fmt][1](df, path)
+                    logger.info(f"Saved {_EXPORTERS[fmt][2]}: {path}")
+            else:
+                futures = {_export_pool.submit(_EXPORTERS[fmt][1], df, path): fmt for fmt, path in jobs.items()}
+                try:
+                    for future in as_completed(futures):
+                        future.result()
+                        fmt = futures[future]
+                        logger.info(f"Saved {_EXPORTERS[fmt][2]}: {jobs[fmt]}")
+                except Exception:
+                    for future in futures:
+                        future.cancel()
+                    raise
             
-            return saved_files
+            return jobs
             
         except Exception as e:
             logger.error(f"Error saving data: {e}")
@@ -134,13 +313,18 @@ class DataProcessor:
     
     def save_metadata(self, scrape_id: str, metadata: Dict[str, Any]) -> str:
         """Save scraping metadata"""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        timestamp = _file_stamp()
         filename = f"scrape_{scrape_id}_{timestamp}_metadata.json"
         metadata_path = os.path.join(self.processed_dir, filename)
         
         try:
-            with open(metadata_path, 'w', encoding='utf-8') as f:
-                json.dump(metadata, f, indent=2, default=str, ensure_ascii=False)
+            # orjson handles datetime/UUID/numpy natively; str() is only the last resort
+            with open(metadata_path, 'wb') as f:
+                f.write(orjson.dumps(
+                    metadata,
+                    default=str,
+                    option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+                ))
             
             logger.info(f"Saved metadata: {metadata_path}")
             return metadata_path
@@ -1,13 +1,23 @@
 # backend/app/services/file_manager.py
 import os
 import json
+import orjson
 import shutil
+import time
+from functools import lru_cache
 from typing import List, Dict, Optional, Any
 from pathlib import Path
 import logging
+from app.core.artifact_index import file_kind, scrape_id_from_filename
 
 logger = logging.getLogger(__name__)
 
+@lru_cache(maxsize=1024)
+def _load_meta_cached(path: str, mtime: float) -> Dict:
+    """Parse a metadata file; mtime is part of the cache key so rewrites are re-read"""
+    with open(path, 'rb') as f:
+        return orjson.loads(f.read())
+
 class FileManager:
     """Handle file operations for scraped data"""
     
@@ -19,30 +29,42 @@ class FileManager:
         # Create directories
         self.raw_dir.mkdir(parents=True, exist_ok=True)
         self.processed_dir.mkdir(parents=True, exist_ok=True)
+        
+        # scrape_id -> file kind -> paths, rebuilt when the directory mtime moves
+        self._index: Dict[str, Dict[str, List[str]]] = {}
+        self._index_mtime_ns: Optional[int] = None
+    
+    def _refresh_index(self) -> None:
+        """Rebuild the scrape file index if the processed directory has changed"""
+        try:
+            mtime_ns = self.processed_dir.stat().st_mtime_ns
+        except FileNotFoundError:
+            self._index = {}
+            self._index_mtime_ns = None
+            return
+        
+        if mtime_ns == self._index_mtime_ns:
+            return
+        
+        index = {}
+        with os.scandir(self.processed_dir) as it:
+            for entry in it:
+                scrape_id = scrape_id_from_filename(entry.name)
+                if not scrape_id or not entry.is_file():
+                    continue
+                files = index.setdefault(scrape_id, {'csv': [], 'json': [], 'metadata': [], 'other': []})
+                files[file_kind(entry.name) or 'other'].append(entry.path)
+        
+        self._index = index
+        self._index_mtime_ns = mtime_ns
     
     def find_files_by_scrape_id(self, scrape_id: str) -> Dict[str, List[str]]:
         """Find all files associated with a scrape ID"""
-        files = {
-            'csv': [],
-            'json': [],
-            'metadata': [],
-            'other': []
-        }
-        
-        pattern = f"scrape_{scrape_id}*"
-        
-        for file_path in self.processed_dir.glob(pattern):
-            if file_path.is_file():
-                if file_path.suffix == '.csv':
-                    files['csv'].append(str(file_path))
-                elif file_path.suffix == '.json' and 'metadata' not in file_path.name:
-                    files['json'].append(str(file_path))
-                elif 'metadata' in file_path.name:
-                    files['metadata'].append(str(file_path))
-                else:
-                    files['other'].append(str(file_path))
+        self._refresh_index()
+        files = self._index.get(scrape_id, {})
         
-        return files
+        # Hand out copies so callers can't mutate the index
+        return {kind: list(files.get(kind, ())) for kind in ('csv', 'json', 'metadata', 'other')}
     
     def get_file_path(self, scrape_id: str, file_type: str) -> Optional[str]:
         """Get the path to a specific file type for a scrape ID"""
@@ -57,16 +79,23 @@ class FileManager:
         """Delete all files associated with a scrape ID"""
         files = self.find_files_by_scrape_id(scrape_id)
         deleted_files = []
+        errors = []
         
         for file_list in files.values():
             for file_path in file_list:
                 try:
-                    os.remove(file_path)
+                    # missing_ok: a file removed concurrently is as good as deleted
+                    Path(file_path).unlink(missing_ok=True)
                     deleted_files.append(os.path.basename(file_path))
-                    logger.info(f"Deleted file: {file_path}")
-                except Exception as e:
-                    logger.error(f"Error deleting file {file_path}: {e}")
+                except OSError as e:
+                    errors.append(f"{file_path}: {e}")
+        
+        logger.info("Deleted %d files for %s", len(deleted_files), scrape_id)
+        if errors:
+            logger.error("Error deleting files for %s: %s", scrape_id, "; ".join(errors))
         
+        self._index.pop(scrape_id, None)
+        self._index_mtime_ns = None
         return deleted_files
     
     def get_scrape_metadata(self, scrape_id: str) -> Optional[Dict]:
@@ -85,23 +114,24 @@ class FileManager:
     def list_all_scrapes(self, limit: int = 50) -> List[Dict]:
         """List all scraping sessions with metadata"""
         scrapes = []
-        metadata_files = list(self.processed_dir.glob("*_metadata.json"))
+        
+        # Stat each file once, for both the sort and the cache key
+        metadata_files = [(p.stat().st_mtime, p) for p in self.processed_dir.glob("*_metadata.json")]
         
         # Sort by modification time (newest first)
-        metadata_files.sort(key=lambda x: x.stat().st_mtime, reverse=True)
+        metadata_files.sort(key=lambda x: x[0], reverse=True)
         
-        for metadata_file in metadata_files[:limit]:
+        for mtime, metadata_file in metadata_files[:limit]:
             try:
-                with open(metadata_file, 'r', encoding='utf-8') as f:
-                    metadata = json.load(f)
-                    scrapes.append({
-                        'scrape_id': metadata.get('scrape_id'),
-                        'url': metadata.get('url'),
-                        'timestamp': metadata.get('timestamp'),
-                        'total_records': metadata.get('total_records', 0),
-                        'columns': len(metadata.get('columns', [])),
-                        'strategy': metadata.get('strategy', {}).get('type', 'unknown')
-                    })
+                metadata = _load_meta_cached(str(metadata_file), mtime)
+                scrapes.append({
+                    'scrape_id': metadata.get('scrape_id'),
+                    'url': metadata.get('url'),
+                    'timestamp': metadata.get('timestamp'),
+                    'total_records': metadata.get('total_records', 0),
+                    'columns': len(metadata.get('columns', [])),
+                    'strategy': metadata.get('strategy', {}).get('type', 'unknown')
+                })
             except Exception as e:
                 logger.error(f"Error reading metadata file {metadata_file}: {e}")
                 continue
@@ -110,8 +140,6 @@ class FileManager:
     
     def cleanup_old_files(self, days_old: int = 30) -> int:
         """Clean up files older than specified days"""
-        import time
-        
         cutoff_time = time.time() - (days_old * 24 * 60 * 60)
         deleted_count = 0
         
@@ -139,24 +167,29 @@ class FileManager:
         oldest_time = float('inf')
         newest_time = 0
         
-        for file_path in self.processed_dir.iterdir():
-            if file_path.is_file():
+        # DirEntry caches its stat result, so each file costs one stat() at most
+        with os.scandir(self.processed_dir) as it:
+            for entry in it:
+                if not entry.is_file():
+                    continue
+                st = entry.stat()
+                size = st.st_size
+                mtime = st.st_mtime
+                
                 stats['total_files'] += 1
-                file_size = file_path.stat().st_size
-                stats['total_size_bytes'] += file_size
+                stats['total_size_bytes'] += size
                 
-                # Track file types
-                ext = file_path.suffix.lower()
+                # Track file types (same keys as Path.suffix, without building a Path)
+                ext = os.path.splitext(entry.name)[1].lower()
                 stats['file_types'][ext] = stats['file_types'].get(ext, 0) + 1
                 
                 # Track oldest and newest
-                mtime = file_path.stat().st_mtime
                 if mtime < oldest_time:
                     oldest_time = mtime
-                    stats['oldest_file'] = str(file_path.name)
+                    stats['oldest_file'] = entry.name
                 if mtime > newest_time:
                     newest_time = mtime
-                    stats['newest_file'] = str(file_path.name)
+                    stats['newest_file'] = entry.name
         
         # Convert bytes to human readable
         stats['total_size_mb'] = round(stats['total_size_bytes'] / (1024 * 1024), 2)
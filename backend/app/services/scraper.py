@@ -3,16 +3,291 @@ import aiohttp
 import asyncio
 import pandas as pd
 from bs4 import BeautifulSoup
-from typing import List, Dict, Optional, Tuple
+import lxml.html
+from lxml import etree
+from cssselect import HTMLTranslator
+from functools import lru_cache
+from typing import List, Dict, Optional, Tuple, Union
 from urllib.parse import urljoin, urlparse
 import logging
+import random
+import re
+import socket
+import sys
+import time
 import uuid
+from collections import defaultdict
+from contextlib import AsyncExitStack, asynccontextmanager
 from datetime import datetime
 import os
-import json
+import orjson
+from app.core import artifact_index
+from app.services.data_processor import write_csv, write_json_records
 
 logger = logging.getLogger(__name__)
 
+# bs4 tree builder; lxml's C parser is several times faster than html.parser
+_HTML_PARSER = 'lxml'
+
+_css_translator = HTMLTranslator()
+
+@lru_cache(maxsize=256)
+def _compile_css(selector: str) -> etree.XPath:
+    """Compile a CSS selector once; like bs4's select it only matches descendants"""
+    return etree.XPath(_css_translator.css_to_xpath(selector, prefix='descendant::'))
+
+def _select_one(element: etree._Element, selector: str) -> Optional[etree._Element]:
+    """First descendant of element matching a CSS selector"""
+    matches = _compile_css(selector)(element)
+    return matches[0] if matches else None
+
+def _source_url(element: etree._Element, base_url: str) -> Optional[str]:
+    """Absolute URL of the first link inside element, if any"""
+    if (link := next(element.iter('a'), None)) is not None and (href := link.get('href')):
+        return urljoin(base_url, href)
+    return None
+
+def _extract_table_columns(root: etree._Element, url: str, table_selector: str) -> Tuple[Dict[str, List[Optional[str]]], int]:
+    """Columns of the first table matching table_selector, keyed by its header row, plus the row count"""
+    table = _select_one(root, table_selector)
+    if table is None:
+        raise ValueError(f"No table found with selector: {table_selector}")
+    
+    rows = list(table.iter('tr'))
+    if not rows:
+        return {}, 0
+    
+    # Extract headers
+    headers = [th.text_content().strip() for th in rows[0].iter('th', 'td')]
+    
+    # One list per column rather than a dict per row; cells a row lacks are None.
+    # Cell text is interned: listings repeat the same category/status/currency
+    # strings thousands of times, and interning keeps one copy of each
+    columns: Dict[str, List[Optional[str]]] = {header: [] for header in headers}
+    
+    def put(header: str, row_idx: int, value: str) -> None:
+        column = columns.get(header)
+        if column is None:
+            column = columns[header] = [None] * row_idx
+        if len(column) > row_idx:  # Repeated header: the later cell wins, as with dict rows
+            column[row_idx] = value
+        else:
+            column.append(value)
+    
+    for row_idx, row in enumerate(rows[1:]):
+        for i, cell in enumerate(row.iter('td', 'th')):
+            header = headers[i] if i < len(headers) else f"Column_{i+1}"
+            put(header, row_idx, sys.intern(cell.text_content().strip()))
+        
+        # Add URL if available
+        if source_url := _source_url(row, url):
+            put('_source_url', row_idx, source_url)
+        
+        for column in columns.values():
+            if len(column) == row_idx:
+                column.append(None)
+    
+    return columns, len(rows) - 1
+
+def _extract_table(root: etree._Element, url: str, table_selector: str) -> List[Dict]:
+    """Rows of the first table matching table_selector, keyed by its header row"""
+    columns, row_count = _extract_table_columns(root, url, table_selector)
+    return [
+        {header: values[i] for header, values in columns.items() if values[i] is not None}
+        for i in range(row_count)
+    ]
+
+def _extract_items(root: etree._Element, url: str, item_selector: str, fields_config: Dict) -> List[Dict]:
+    """One record per element matching item_selector, with the configured fields"""
+    items = _compile_css(item_selector)(root)
+    if not items:
+        raise ValueError(f"No items found with selector: {item_selector}")
+    
+    data = []
+    for item in items:
+        row_data = {}
+        
+        # Extract configured fields
+        for field_name, field_config in fields_config.items():
+            element = _select_one(item, field_config['selector'])
+            if element is not None:
+                if field_config.get('attribute'):
+                    row_data[field_name] = element.get(field_config['attribute'], '')
+                else:
+                    row_data[field_name] = sys.intern(element.text_content().strip())
+        
+        # Add source URL
+        if source_url := _source_url(item, url):
+            row_data['_source_url'] = source_url
+        
+        data.append(row_data)
+    
+    return data
+
+# Common pagination patterns, compiled once rather than on every page
+_NEXT_SELECTORS = (
+    'a[rel="next"]',
+    '.next a',
+    '.pagination .next',
+    'a:contains("Next")',
+    'a:contains("→")'
+)
+_NEXT_XPATHS = tuple(_compile_css(selector) for selector in _NEXT_SELECTORS)
+
+def _find_next_url(root: etree._Element, url: str) -> Optional[str]:
+    """Absolute URL of the page's "next" link, if it has one"""
+    for xpath in _NEXT_XPATHS:
+        if (matches := xpath(root)) and (href := matches[0].get('href')):
+            return urljoin(url, href)
+    return None
+
+def _page_signature(records: List[Dict]) -> Tuple:
+    """Hashable fingerprint of a page's records, to spot a page served twice"""
+    return tuple(tuple(record.items()) for record in records)
+
+# Numbered pagination (?page=N / &page=N) lets later pages be fetched without following links
+_PAGE_PARAM_RE = re.compile(r'[?&]page=(\d+)')
+_PAGE_CONCURRENCY = 8
+
+# One pooled connector for the application's event loop, shared by every scrape
+# so keep-alive connections (and their TLS sessions) outlive individual jobs.
+# It is opened and closed by the app's startup/shutdown hooks; scrapers running
+# on any other loop (tests, scripts) get a private connector closed with them
+_shared_connector: Optional[aiohttp.TCPConnector] = None
+_shared_connector_loop: Optional[asyncio.AbstractEventLoop] = None
+
+def _new_connector() -> aiohttp.TCPConnector:
+    return aiohttp.TCPConnector(
+        limit=100,
+        limit_per_host=16,
+        ttl_dns_cache=300,
+        keepalive_timeout=75
+    )
+
+async def open_shared_connector() -> aiohttp.TCPConnector:
+    """Create the shared connector on the running loop; called on application startup"""
+    global _shared_connector, _shared_connector_loop
+    await close_shared_connector()
+    _shared_connector = _new_connector()
+    _shared_connector_loop = asyncio.get_running_loop()
+    return _shared_connector
+
+def get_shared_connector() -> Optional[aiohttp.TCPConnector]:
+    """The shared connector if it belongs to the running loop, else None"""
+    if _shared_connector is None or _shared_connector.closed:
+        return None
+    if _shared_connector_loop is not asyncio.get_running_loop():
+        return None
+    return _shared_connector
+
+async def close_shared_connector() -> None:
+    """Close the shared connector; called on application shutdown"""
+    global _shared_connector, _shared_connector_loop
+    if _shared_connector is not None and not _shared_connector.closed:
+        await _shared_connector.close()
+    _shared_connector = None
+    _shared_connector_loop = None
+
+# Retry policy for transient upstream failures
+_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+_MAX_RETRIES = 5
+_MAX_BACKOFF = 60.0
+# Upper bound on time spent backing off for one request, so an API call can't hang for minutes
+_RETRY_BUDGET = 45.0
+_PER_HOST_CONCURRENCY = 8
+
+def _retry_delay(headers, attempt: int) -> float:
+    """Seconds to wait before retry number attempt, honoring Retry-After when given"""
+    retry_after = headers.get('Retry-After')
+    if retry_after and retry_after.isdigit():
+        return min(float(retry_after), _MAX_BACKOFF)
+    return min(2 ** attempt + random.random(), _MAX_BACKOFF)
+
+def _may_retry(attempt: int, delay: float, deadline: float) -> bool:
+    """Whether another attempt fits in both the retry count and the overall time budget"""
+    return attempt < _MAX_RETRIES and time.monotonic() + delay < deadline
+
+def _is_transient(error: Exception) -> bool:
+    """Connection failures worth retrying; DNS and TLS failures won't fix themselves"""
+    if isinstance(error, (aiohttp.ClientSSLError, aiohttp.InvalidURL)):
+        return False
+    if isinstance(error, aiohttp.ClientConnectorError) and isinstance(error.os_error, socket.gaierror):
+        return False
+    return True
+
+def _rate_limit_resume_at(headers) -> Optional[float]:
+    """Monotonic time the host's rate-limit window reopens, if it reported being exhausted"""
+    if 'X-RateLimit-Remaining' not in headers or 'X-RateLimit-Reset' not in headers:
+        return None
+    try:
+        if int(headers['X-RateLimit-Remaining']) > 0:
+            return None
+        reset = float(headers['X-RateLimit-Reset'])
+    except ValueError:
+        return None
+    # Reset is either seconds to wait or an epoch timestamp
+    wait = reset - time.time() if reset > 1e9 else reset
+    return time.monotonic() + min(max(wait, 0.0), _MAX_BACKOFF)
+
+# Class-name fragments that suggest repeated listing items
+_COMMON_ITEM_CLASSES = ('product', 'item', 'card', 'listing', 'entry', 'post', 'article')
+_SECTION_TAGS = frozenset({'section', 'article', 'div'})
+
+def _parse_html(content: str) -> etree._Element:
+    """Parse a page straight into an lxml tree rooted at <html>, skipping bs4's wrapper"""
+    if not content.strip():
+        return lxml.html.document_fromstring('<html></html>')
+    try:
+        # document_fromstring keeps fragments like a bare <table> under <html>
+        return lxml.html.document_fromstring(content)
+    except ValueError:
+        # str input with an XML encoding declaration (XHTML); let lxml read the bytes
+        return lxml.html.document_fromstring(content.encode('utf-8'), parser=lxml.html.HTMLParser(encoding='utf-8'))
+
+# Columns named like these hold numbers behind currency symbols and units
+_NUMERIC_COLUMNS = frozenset({'price', 'cost', 'amount', 'value', 'rating', 'score'})
+_NON_NUMERIC_RE = re.compile(r'[^\d.]')
+
+# Text columns with fewer distinct values than this share of rows become categoricals;
+# below the row floor the dtype change isn't worth it
+_CATEGORY_MAX_RATIO = 0.5
+_CATEGORY_MIN_ROWS = 1000
+
+def _coerce_numeric(series: pd.Series) -> pd.Series:
+    """Strip everything but digits and dots and parse; unparseable cells become NaN"""
+    if series.dtype == object:
+        series = series.str.replace(_NON_NUMERIC_RE, '', regex=True)
+    return pd.to_numeric(series, errors='coerce')
+
+# Bytes handed to the parser at a time while a body is still downloading
+_STREAM_CHUNK_SIZE = 64 * 1024
+
+async def _read_tree(response: aiohttp.ClientResponse) -> etree._Element:
+    """Parse a response body as it arrives instead of buffering it as one str first"""
+    charset = response.charset
+    if charset is None:
+        # Undeclared encoding: aiohttp's text() sniffs it, where lxml would assume latin-1
+        return _parse_html(await response.text())
+    
+    try:
+        parser = etree.HTMLPullParser(encoding=charset)
+    except LookupError:
+        return _parse_html(await response.text())
+    parser.set_element_class_lookup(lxml.html.HtmlElementClassLookup())
+    
+    received = False
+    async for chunk in response.content.iter_chunked(_STREAM_CHUNK_SIZE):
+        parser.feed(chunk)
+        received = received or bool(chunk.strip())
+    if not received:
+        return _parse_html('')
+    return parser.close()
+
+def _write_metadata(path: str, metadata: Dict) -> None:
+    """Write a scrape's metadata sidecar as indented JSON"""
+    with open(path, 'wb') as f:
+        f.write(orjson.dumps(metadata, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+
 class UniversalScraper:
     """Universal web scraper for extracting tabular data from any website"""
     
@@ -20,13 +295,17 @@ class UniversalScraper:
         self.max_pages = max_pages
         self.timeout = timeout
         self.session = None
+        # Per-host throttling state, scoped to this scraper's session
+        self._host_slots = defaultdict(lambda: asyncio.Semaphore(_PER_HOST_CONCURRENCY))
+        self._host_resume_at: Dict[str, float] = {}
         
     async def __aenter__(self):
         """Async context manager entry"""
-        connector = aiohttp.TCPConnector(limit=10, limit_per_host=5)
         timeout = aiohttp.ClientTimeout(total=self.timeout)
+        shared_connector = get_shared_connector()
         self.session = aiohttp.ClientSession(
-            connector=connector, 
+            connector=shared_connector or _new_connector(),
+            connector_owner=shared_connector is None,
             timeout=timeout,
             headers={
                 'User-Agent': 'ScrapeEase/1.0 (Web Scraping Platform)'
@@ -39,10 +318,63 @@ class UniversalScraper:
         if self.session:
             await self.session.close()
     
+    @asynccontextmanager
+    async def _get(self, url: str):
+        """session.get with per-host throttling and backoff retries on 429/5xx and connection errors"""
+        host = urlparse(url).netloc
+        deadline = time.monotonic() + _RETRY_BUDGET
+        for attempt in range(_MAX_RETRIES + 1):
+            wait = self._host_resume_at.get(host, 0.0) - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            
+            # The host slot is only held while a request is in flight, never
+            # across a backoff sleep, so one struggling page can't stall the rest
+            async with self._host_slots[host], AsyncExitStack() as stack:
+                try:
+                    response = await stack.enter_async_context(self.session.get(url))
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    delay = _retry_delay({}, attempt)
+                    if not _is_transient(e) or not _may_retry(attempt, delay, deadline):
+                        raise
+                    logger.warning(f"Request to {url} failed ({e!r}), retrying in {delay:.1f}s")
+                else:
+                    retry = response.status in _RETRY_STATUSES
+                    if retry:
+                        delay = _retry_delay(response.headers, attempt)
+                        retry = _may_retry(attempt, delay, deadline)
+                    if retry:
+                        logger.warning(f"HTTP {response.status} from {url}, retrying in {delay:.1f}s")
+                    else:
+                        resume_at = _rate_limit_resume_at(response.headers)
+                        if resume_at is not None:
+                            self._host_resume_at[host] = resume_at
+                        yield response
+                        return
+            await asyncio.sleep(delay)
+    
+    async def check_reachable(self, url: str) -> Dict[str, any]:
+        """Cheap reachability check: a HEAD request, no body download or parse"""
+        try:
+            async with self.session.head(url, allow_redirects=True) as response:
+                # Some servers don't implement HEAD; that still proves they're up
+                if response.status < 400 or response.status in (405, 501):
+                    return {"valid": True, "status": response.status}
+                return {
+                    "valid": False,
+                    "status": response.status,
+                    "error": f"HTTP {response.status}: {response.reason}"
+                }
+        except Exception as e:
+            return {
+                "valid": False,
+                "error": str(e)
+            }
+    
     async def validate_url(self, url: str) -> Dict[str, any]:
         """Validate if URL is accessible and contains scrapable content"""
         try:
-            async with self.session.get(url) as response:
+            async with self._get(url) as response:
                 if response.status != 200:
                     return {
                         "valid": False,
@@ -50,7 +382,7 @@ class UniversalScraper:
                     }
                 
                 content = await response.text()
-                soup = BeautifulSoup(content, 'html.parser')
+                soup = BeautifulSoup(content, _HTML_PARSER)
                 
                 # Check for common table structures
                 tables = soup.find_all('table')
@@ -74,57 +406,70 @@ class UniversalScraper:
                 "error": str(e)
             }
     
+    def _detect_strategies(self, root: etree._Element) -> List[Dict]:
+        """Candidate extraction strategies for a parsed page, best first"""
+        strategies = []
+        
+        # All three strategies are derived from a single walk of the tree
+        tables = []
+        item_counts = dict.fromkeys(_COMMON_ITEM_CLASSES, 0)
+        first_items = {}
+        repeated_classes = {}
+        for element in root.iter(etree.Element):
+            if element.tag == 'table' and len(tables) < 3:  # Analyze first 3 tables
+                tables.append(element)
+            
+            class_attr = element.get('class')
+            if class_attr is None:
+                continue
+            
+            lowered = class_attr.lower()
+            for class_name in _COMMON_ITEM_CLASSES:
+                if class_name in lowered:
+                    item_counts[class_name] += 1
+                    first_items.setdefault(class_name, element)
+            
+            if element.tag in _SECTION_TAGS:
+                class_str = ' '.join(class_attr.split())
+                repeated_classes[class_str] = repeated_classes.get(class_str, 0) + 1
+        
+        # Strategy 1: HTML Tables
+        for i, table in enumerate(tables):
+            rows = list(table.iter('tr'))
+            if len(rows) > 1:
+                strategies.append({
+                    "type": "table",
+                    "selector": f"table:nth-of-type({i+1})",
+                    "estimated_rows": len(rows),
+                    "estimated_columns": sum(1 for _ in rows[0].iter('th', 'td')) if rows else 0
+                })
+        
+        # Strategy 2: List-based data (e.g., product listings)
+        for class_name, count in item_counts.items():
+            if count > 3:  # Must have multiple items
+                strategies.append({
+                    "type": "list_items",
+                    "selector": f".{class_name}",
+                    "estimated_items": count,
+                    "sample_content": first_items[class_name].text_content()[:100]
+                })
+        
+        # Strategy 3: Structured divs/sections
+        for class_str, count in repeated_classes.items():
+            if count > 3:  # Repeated structure
+                strategies.append({
+                    "type": "repeated_sections",
+                    "selector": f".{class_str.replace(' ', '.')}",
+                    "estimated_items": count
+                })
+        
+        return strategies
+    
     async def detect_data_structure(self, url: str) -> Dict[str, any]:
         """Detect the data structure and suggest extraction strategies"""
         try:
-            async with self.session.get(url) as response:
-                content = await response.text()
-                soup = BeautifulSoup(content, 'html.parser')
-                
-                strategies = []
-                
-                # Strategy 1: HTML Tables
-                tables = soup.find_all('table')
-                if tables:
-                    for i, table in enumerate(tables[:3]):  # Analyze first 3 tables
-                        rows = table.find_all('tr')
-                        if len(rows) > 1:
-                            strategies.append({
-                                "type": "table",
-                                "selector": f"table:nth-of-type({i+1})",
-                                "estimated_rows": len(rows),
-                                "estimated_columns": len(rows[0].find_all(['th', 'td'])) if rows else 0
-                            })
-                
-                # Strategy 2: List-based data (e.g., product listings)
-                common_item_classes = [
-                    'product', 'item', 'card', 'listing', 'entry', 'post', 'article'
-                ]
-                
-                for class_name in common_item_classes:
-                    items = soup.find_all(class_=lambda x: x and class_name in x.lower())
-                    if len(items) > 3:  # Must have multiple items
-                        strategies.append({
-                            "type": "list_items",
-                            "selector": f".{class_name}",
-                            "estimated_items": len(items),
-                            "sample_content": items[0].get_text()[:100] if items else ""
-                        })
-                
-                # Strategy 3: Structured divs/sections
-                sections = soup.find_all(['section', 'article', 'div'], class_=True)
-                repeated_classes = {}
-                for section in sections:
-                    class_str = ' '.join(section.get('class', []))
-                    repeated_classes[class_str] = repeated_classes.get(class_str, 0) + 1
-                
-                for class_str, count in repeated_classes.items():
-                    if count > 3:  # Repeated structure
-                        strategies.append({
-                            "type": "repeated_sections",
-                            "selector": f".{class_str.replace(' ', '.')}",
-                            "estimated_items": count
-                        })
+            async with self._get(url) as response:
+                strategies = self._detect_strategies(await _read_tree(response))
                 
                 return {
                     "success": True,
@@ -138,76 +483,77 @@ class UniversalScraper:
                 "error": str(e)
             }
     
-    async def scrape_table_data(self, url: str, table_selector: str = "table") -> List[Dict]:
-        """Scrape data from HTML tables"""
-        async with self.session.get(url) as response:
-            content = await response.text()
-            soup = BeautifulSoup(content, 'html.parser')
-            
-            table = soup.select_one(table_selector)
-            if not table:
-                raise ValueError(f"No table found with selector: {table_selector}")
-            
-            rows = table.find_all('tr')
-            if not rows:
-                return []
-            
-            # Extract headers
-            header_row = rows[0]
-            headers = [th.get_text().strip() for th in header_row.find_all(['th', 'td'])]
-            
-            # Extract data rows
-            data = []
-            for row in rows[1:]:
-                cells = row.find_all(['td', 'th'])
-                row_data = {}
-                for i, cell in enumerate(cells):
-                    header = headers[i] if i < len(headers) else f"Column_{i+1}"
-                    row_data[header] = cell.get_text().strip()
-                
-                # Add URL if available
-                link = row.find('a')
-                if link and link.get('href'):
-                    row_data['_source_url'] = urljoin(url, link['href'])
-                
-                data.append(row_data)
-            
-            return data
+    async def _fetch_tree(self, url: str) -> etree._Element:
+        """Fetch a page and parse it once for both extraction and pagination"""
+        async with self._get(url) as response:
+            return await _read_tree(response)
+    
+    async def scrape_table_data(self, url: str, table_selector: str = "table",
+                                as_columns: bool = False) -> Union[List[Dict], Dict[str, List]]:
+        """Scrape data from HTML tables, as records or (as_columns) one list per column"""
+        root = await self._fetch_tree(url)
+        if as_columns:
+            return _extract_table_columns(root, url, table_selector)[0]
+        return _extract_table(root, url, table_selector)
     
     async def scrape_list_items(self, url: str, item_selector: str, fields_config: Dict) -> List[Dict]:
         """Scrape data from list-based structures"""
-        async with self.session.get(url) as response:
-            content = await response.text()
-            soup = BeautifulSoup(content, 'html.parser')
-            
-            items = soup.select(item_selector)
-            if not items:
-                raise ValueError(f"No items found with selector: {item_selector}")
-            
-            data = []
-            for item in items:
-                row_data = {}
-                
-                # Extract configured fields
-                for field_name, field_config in fields_config.items():
-                    element = item.select_one(field_config['selector'])
-                    if element:
-                        if field_config.get('attribute'):
-                            row_data[field_name] = element.get(field_config['attribute'], '')
-                        else:
-                            row_data[field_name] = element.get_text().strip()
-                
-                # Add source URL
-                link = item.find('a')
-                if link and link.get('href'):
-                    row_data['_source_url'] = urljoin(url, link['href'])
-                
-                data.append(row_data)
-            
-            return data
+        return _extract_items(await self._fetch_tree(url), url, item_selector, fields_config)
+    
+    def _extract_page(self, root: etree._Element, url: str, strategy: Dict) -> List[Dict]:
+        """Run the strategy's extractor on a parsed page"""
+        if strategy['type'] == 'table':
+            return _extract_table(root, url, strategy['selector'])
+        return _extract_items(root, url, strategy['selector'], strategy.get('fields', {}))
+    
+    async def _fetch_and_extract(self, url: str, strategy: Dict) -> Tuple[List[Dict], bool]:
+        """Fetch one page and extract its records, reporting whether it links to a next page"""
+        root = await self._fetch_tree(url)
+        return self._extract_page(root, url, strategy), _find_next_url(root, url) is not None
     
-    async def scrape_with_pagination(self, base_url: str, strategy: Dict) -> List[Dict]:
-        """Scrape data with automatic pagination detection"""
+    async def _scrape_numbered_pages(self, next_url: str, page_match: re.Match, strategy: Dict,
+                                     limit: int, first_page_data: List[Dict]) -> List[Dict]:
+        """Fetch pages next_url, next_url+1, ... concurrently, up to limit pages"""
+        first_page = int(page_match.group(1))
+        urls = [
+            next_url[:page_match.start(1)] + str(page) + next_url[page_match.end(1):]
+            for page in range(first_page, first_page + limit)
+        ]
+        
+        # Many sites clamp an out-of-range ?page=N to the last (or first) page,
+        # so a page we've already seen also marks the end
+        seen_pages = {_page_signature(first_page_data)}
+        data = []
+        # Fetch in waves so we stop shortly after the last real page instead of
+        # requesting every page up to max_pages
+        for start in range(0, len(urls), _PAGE_CONCURRENCY):
+            batch = urls[start:start + _PAGE_CONCURRENCY]
+            logger.info(f"Scraping pages {first_page + start}-{first_page + start + len(batch) - 1} of {next_url}")
+            results = await asyncio.gather(
+                *(self._fetch_and_extract(url, strategy) for url in batch),
+                return_exceptions=True
+            )
+            for url, result in zip(batch, results):
+                if isinstance(result, Exception):
+                    logger.info(f"Pagination ended at {url}: {result}")
+                    return data
+                page_data, has_next = result
+                signature = _page_signature(page_data)
+                if not page_data or signature in seen_pages:  # Past the last page
+                    return data
+                seen_pages.add(signature)
+                data.extend(page_data)
+                if not has_next:
+                    return data
+        
+        return data
+    
+    async def scrape_with_pagination(self, base_url: str, strategy: Dict,
+                                     first_page: Optional[etree._Element] = None) -> List[Dict]:
+        """Scrape data with automatic pagination detection
+        
+        first_page is base_url's already-parsed tree, if the caller has it.
+        """
         all_data = []
         current_url = base_url
         page_count = 0
@@ -216,56 +562,50 @@ class UniversalScraper:
             logger.info(f"Scraping page {page_count + 1}: {current_url}")
             
             try:
-                # Scrape current page based on strategy
-                if strategy['type'] == 'table':
-                    page_data = await self.scrape_table_data(current_url, strategy['selector'])
-                elif strategy['type'] == 'list_items':
-                    page_data = await self.scrape_list_items(
-                        current_url, 
-                        strategy['selector'], 
-                        strategy.get('fields', {})
-                    )
-                else:
+                if strategy['type'] not in ('table', 'list_items'):
                     break
                 
+                # One fetch and parse per page serves both extraction and pagination
+                if page_count == 0 and first_page is not None:
+                    root = first_page
+                else:
+                    root = await self._fetch_tree(current_url)
+                
+                # Scrape current page based on strategy
+                page_data = self._extract_page(root, current_url, strategy)
+                
                 all_data.extend(page_data)
                 
                 # Try to find next page
-                async with self.session.get(current_url) as response:
-                    content = await response.text()
-                    soup = BeautifulSoup(content, 'html.parser')
-                    
-                    # Common pagination patterns
-                    next_selectors = [
-                        'a[rel="next"]',
-                        '.next a',
-                        '.pagination .next',
-                        'a:contains("Next")',
-                        'a:contains("→")'
-                    ]
-                    
-                    next_url = None
-                    for selector in next_selectors:
-                        next_link = soup.select_one(selector)
-                        if next_link and next_link.get('href'):
-                            next_url = urljoin(current_url, next_link['href'])
-                            break
-                    
-                    current_url = next_url
-                    page_count += 1
-                    
+                next_url = _find_next_url(root, current_url)
+                
+                page_count += 1
+                
+                # Numbered pages don't need to be discovered one link at a time
+                page_match = _PAGE_PARAM_RE.search(next_url) if next_url else None
+                if page_match and page_count < self.max_pages:
+                    all_data.extend(await self._scrape_numbered_pages(
+                        next_url, page_match, strategy, self.max_pages - page_count, page_data
+                    ))
+                    break
+                
+                current_url = next_url
+                
             except Exception as e:
                 logger.error(f"Error scraping page {current_url}: {e}")
                 break
         
         return all_data
     
-    def clean_and_process_data(self, raw_data: List[Dict]) -> pd.DataFrame:
-        """Clean and process the scraped data"""
-        if not raw_data:
+    def clean_and_process_data(self, raw_data: Union[List[Dict], Dict[str, List], pd.DataFrame]) -> pd.DataFrame:
+        """Clean and process the scraped data, given as records, columns or a DataFrame"""
+        if isinstance(raw_data, pd.DataFrame):
+            df = raw_data
+        elif not raw_data:
             return pd.DataFrame()
-        
-        df = pd.DataFrame(raw_data)
+        else:
+            # Columns from scrape_table_data(as_columns=True) need no record-to-column transpose
+            df = pd.DataFrame(raw_data, copy=False)
         
         # Remove completely empty rows
         df = df.dropna(how='all')
@@ -275,14 +615,16 @@ class UniversalScraper:
             df[col] = df[col].astype(str).str.strip()
             df[col] = df[col].replace('', None)
         
-        # Try to convert numeric columns
-        for col in df.columns:
-            if col.lower() in ['price', 'cost', 'amount', 'value', 'rating', 'score']:
-                # Remove currency symbols and convert to numeric
-                df[col] = pd.to_numeric(
-                    df[col].astype(str).str.replace(r'[^\d.]', '', regex=True), 
-                    errors='ignore'
-                )
+        # Try to convert numeric columns, all in one pass
+        numeric_cols = [col for col in df.columns if str(col).lower() in _NUMERIC_COLUMNS]
+        if numeric_cols:
+            df[numeric_cols] = df[numeric_cols].apply(_coerce_numeric)
+        
+        # Store repetitive text columns as categories on large scrapes
+        if len(df) >= _CATEGORY_MIN_ROWS:
+            for col in df.select_dtypes(include=['object']).columns:
+                if df[col].nunique() < len(df) * _CATEGORY_MAX_RATIO:
+                    df[col] = df[col].astype('category')
         
         return df
     
@@ -291,28 +633,30 @@ class UniversalScraper:
         scrape_id = str(uuid.uuid4())
         
         try:
-            # Validate URL first
-            validation = await self.validate_url(url)
-            if not validation['valid']:
-                return {
-                    "success": False,
-                    "error": validation['error'],
-                    "scrape_id": scrape_id
-                }
+            # Fetch and parse the first page once; it serves validation,
+            # strategy detection and extraction alike
+            async with self._get(url) as response:
+                if response.status != 200:
+                    return {
+                        "success": False,
+                        "error": f"HTTP {response.status}: {response.reason}",
+                        "scrape_id": scrape_id
+                    }
+                first_page = await _read_tree(response)
             
             # Auto-detect strategy if not provided
             if not strategy:
-                detection = await self.detect_data_structure(url)
-                if not detection['success'] or not detection['strategies']:
+                strategies = self._detect_strategies(first_page)
+                if not strategies:
                     return {
                         "success": False,
                         "error": "No suitable data structure detected",
                         "scrape_id": scrape_id
                     }
-                strategy = detection['recommended_strategy']
+                strategy = strategies[0]
             
             # Perform scraping
-            raw_data = await self.scrape_with_pagination(url, strategy)
+            raw_data = await self.scrape_with_pagination(url, strategy, first_page=first_page)
             
             if not raw_data:
                 return {
@@ -335,8 +679,11 @@ class UniversalScraper:
             csv_path = f"data/processed/{filename}.csv"
             json_path = f"data/processed/{filename}.json"
             
-            df.to_csv(csv_path, index=False)
-            df.to_json(json_path, orient='records', indent=2)
+            # Off the event loop so other scrapes keep reading their sockets meanwhile
+            await asyncio.gather(
+                asyncio.to_thread(write_csv, df, csv_path),
+                asyncio.to_thread(write_json_records, df, json_path)
+            )
             
             # Save metadata
             metadata = {
@@ -352,20 +699,23 @@ class UniversalScraper:
                 }
             }
             
+            # Written last: its presence tells other workers the data files are complete
             metadata_path = f"data/processed/{filename}_metadata.json"
-            with open(metadata_path, 'w') as f:
-                json.dump(metadata, f, indent=2)
+            await asyncio.to_thread(_write_metadata, metadata_path, metadata)
+            
+            files = {
+                "csv": csv_path,
+                "json": json_path,
+                "metadata": metadata_path
+            }
+            artifact_index.register(scrape_id, files)
             
             return {
                 "success": True,
                 "scrape_id": scrape_id,
                 "total_records": len(df),
                 "columns": list(df.columns),
-                "files": {
-                    "csv": csv_path,
-                    "json": json_path,
-                    "metadata": metadata_path
-                },
+                "files": files,
                 "preview": df.head(5).to_dict('records')
             }
             
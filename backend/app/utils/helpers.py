@@ -2,22 +2,35 @@
 import hashlib
 import uuid
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Union
 import re
+import pandas as pd
 from urllib.parse import urljoin, urlparse
 
+_FILENAME_RE = re.compile(r'[<>:"/\\|?*]')
+_COLNAME_RE = re.compile(r'[^a-zA-Z0-9_]')
+_UNDERSCORES_RE = re.compile(r'_+')
+# Thousands separators and currency symbols stripped before parsing numbers
+_CURRENCY_RE = re.compile(r'[,$€£]')
+
 def generate_scrape_id() -> str:
     """Generate a unique ID for scraping sessions"""
     return str(uuid.uuid4())
 
-def generate_content_hash(content: str) -> str:
-    """Generate hash for content deduplication"""
-    return hashlib.md5(content.encode()).hexdigest()
+def generate_content_hash(content: Union[str, bytes]) -> str:
+    """Generate hash for content deduplication
+
+    SHA-256 runs on the CPU's SHA extensions through OpenSSL, unlike MD5, and
+    raw response bytes are hashed as-is without an extra encoded copy.
+    """
+    if isinstance(content, str):
+        content = content.encode()
+    return hashlib.sha256(content).hexdigest()
 
 def clean_filename(filename: str) -> str:
     """Clean filename for safe file system storage"""
     # Remove or replace invalid characters
-    filename = re.sub(r'[<>:"/\\|?*]', '_', filename)
+    filename = _FILENAME_RE.sub('_', filename)
     # Limit length
     if len(filename) > 200:
         filename = filename[:200]
@@ -67,9 +80,9 @@ def truncate_text(text: str, max_length: int = 100) -> str:
 def sanitize_column_name(name: str) -> str:
     """Sanitize column names for better CSV/JSON compatibility"""
     # Remove special characters and replace with underscore
-    name = re.sub(r'[^a-zA-Z0-9_]', '_', name)
+    name = _COLNAME_RE.sub('_', name)
     # Remove multiple underscores
-    name = re.sub(r'_+', '_', name)
+    name = _UNDERSCORES_RE.sub('_', name)
     # Remove leading/trailing underscores
     name = name.strip('_')
     # Ensure it's not empty
@@ -77,36 +90,39 @@ def sanitize_column_name(name: str) -> str:
         name = "column"
     return name
 
-def detect_data_types(data: List[Dict[str, Any]]) -> Dict[str, str]:
-    """Detect likely data types for columns"""
-    if not data:
+def detect_data_types(data: Union[List[Dict[str, Any]], pd.DataFrame]) -> Dict[str, str]:
+    """Detect likely data types for columns, from records or an already-built DataFrame"""
+    if data is None or len(data) == 0:
         return {}
     
+    if not isinstance(data, pd.DataFrame):
+        # Columns come from the first record, as they always have
+        data = pd.DataFrame(data, columns=list(data[0].keys()))
+    
     type_detection = {}
     
-    for column in data[0].keys():
-        values = [row.get(column) for row in data if row.get(column) is not None]
+    for column in data.columns:
+        values = data[column].dropna()
         
-        if not values:
+        if values.empty:
             type_detection[column] = "string"
             continue
         
-        # Check if all values are numeric
-        numeric_count = 0
-        for value in values:
-            try:
-                float(str(value).replace(',', '').replace('$', '').replace('€', '').replace('£', ''))
-                numeric_count += 1
-            except:
-                pass
+        # Share of values that parse as numbers once currency formatting is stripped
+        if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+            numeric_ratio = 1.0
+        else:
+            stripped = values.astype(str).str.replace(_CURRENCY_RE, '', regex=True)
+            numeric_ratio = pd.to_numeric(stripped, errors='coerce').notna().mean()
         
-        if numeric_count / len(values) > 0.8:  # 80% are numeric
+        name = str(column).lower()
+        if numeric_ratio > 0.8:  # 80% are numeric
             type_detection[column] = "numeric"
-        elif any(keyword in column.lower() for keyword in ['url', 'link', 'href']):
+        elif any(keyword in name for keyword in ['url', 'link', 'href']):
             type_detection[column] = "url"
-        elif any(keyword in column.lower() for keyword in ['date', 'time', 'created', 'updated']):
+        elif any(keyword in name for keyword in ['date', 'time', 'created', 'updated']):
             type_detection[column] = "datetime"
         else:
             type_detection[column] = "string"
     
-    return type_detection
\ No newline at end of file
+    return type_detection
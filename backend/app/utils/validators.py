@@ -1,10 +1,76 @@
 #backend/app/utils/validators.py
+import asyncio
 import re
+import time
+import aiohttp
+from collections import OrderedDict
 from urllib.parse import urlparse
-from typing import Dict, Any, Optional, List
-import requests
+from urllib.robotparser import RobotFileParser
+from typing import Dict, Any, Optional, List, NamedTuple
 from pydantic import HttpUrl
 
+_ROBOTS_USER_AGENT = 'ScrapeEase'
+
+class _RobotsInfo(NamedTuple):
+    """A robots.txt parsed once and reused for every URL on its domain"""
+    content: str
+    parser: RobotFileParser
+    disallowed_paths: List[str]
+    crawl_delay: Optional[float]
+    fetched_at: float
+
+# robots_url -> parsed robots.txt, least recently used first
+_robots_cache: "OrderedDict[str, _RobotsInfo]" = OrderedDict()
+_ROBOTS_CACHE_SIZE = 256
+_ROBOTS_TTL = 3600
+
+def _parse_robots(content: str) -> _RobotsInfo:
+    """Parse robots.txt into a RobotFileParser plus the summary fields we report"""
+    parser = RobotFileParser()
+    parser.parse(content.splitlines())
+    
+    # Simple robots.txt parsing
+    disallowed_paths = []
+    crawl_delay = None
+    
+    for line in content.split('\n'):
+        line = line.strip().lower()
+        if line.startswith('disallow:'):
+            path = line.split(':', 1)[1].strip()
+            if path:
+                disallowed_paths.append(path)
+        elif line.startswith('crawl-delay:'):
+            try:
+                crawl_delay = float(line.split(':', 1)[1].strip())
+            except ValueError:
+                pass
+    
+    return _RobotsInfo(content, parser, disallowed_paths, crawl_delay, time.monotonic())
+
+async def _fetch_robots(robots_url: str, session: Optional[aiohttp.ClientSession]) -> _RobotsInfo:
+    """robots.txt for a domain, fetched at most once per TTL"""
+    cached = _robots_cache.get(robots_url)
+    if cached is not None and time.monotonic() - cached.fetched_at < _ROBOTS_TTL:
+        _robots_cache.move_to_end(robots_url)
+        return cached
+    
+    try:
+        if session is None:
+            async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=5)) as own_session:
+                async with own_session.get(robots_url) as response:
+                    robots_content = await response.text() if response.status == 200 else ""
+        else:
+            async with session.get(robots_url, timeout=aiohttp.ClientTimeout(total=5)) as response:
+                robots_content = await response.text() if response.status == 200 else ""
+    except (aiohttp.ClientError, asyncio.TimeoutError, UnicodeDecodeError):
+        robots_content = ""
+    
+    info = _parse_robots(robots_content)
+    _robots_cache[robots_url] = info
+    if len(_robots_cache) > _ROBOTS_CACHE_SIZE:
+        _robots_cache.popitem(last=False)
+    return info
+
 class URLValidator:
     """Validate and analyze URLs for scraping compatibility"""
     
@@ -18,41 +84,24 @@ class URLValidator:
             return False
     
     @staticmethod
-    def is_scrapable_domain(url: str) -> Dict[str, Any]:
-        """Check if domain allows scraping"""
+    async def is_scrapable_domain(url: str, session: Optional[aiohttp.ClientSession] = None) -> Dict[str, Any]:
+        """Check if domain allows scraping
+        
+        robots.txt is fetched once per domain and cached, so checking every page
+        of a paginated scrape costs one request. Pass the scraper's session to
+        reuse its connection pool.
+        """
         try:
-            domain = urlparse(url).netloc
-            
-            # Check robots.txt (simplified)
-            robots_url = f"{urlparse(url).scheme}://{domain}/robots.txt"
-            
-            try:
-                response = requests.get(robots_url, timeout=5)
-                robots_content = response.text if response.status_code == 200 else ""
-            except:
-                robots_content = ""
-            
-            # Simple robots.txt parsing
-            disallowed_paths = []
-            crawl_delay = None
-            
-            for line in robots_content.split('\n'):
-                line = line.strip().lower()
-                if line.startswith('disallow:'):
-                    path = line.split(':', 1)[1].strip()
-                    if path:
-                        disallowed_paths.append(path)
-                elif line.startswith('crawl-delay:'):
-                    try:
-                        crawl_delay = float(line.split(':', 1)[1].strip())
-                    except:
-                        pass
+            parsed = urlparse(url)
+            robots_url = f"{parsed.scheme}://{parsed.netloc}/robots.txt"
+            robots = await _fetch_robots(robots_url, session)
             
             return {
                 "scrapable": True,
-                "robots_txt": robots_content[:500],  # First 500 chars
-                "disallowed_paths": disallowed_paths,
-                "crawl_delay": crawl_delay,
+                "allowed": robots.parser.can_fetch(_ROBOTS_USER_AGENT, url),
+                "robots_txt": robots.content[:500],  # First 500 chars
+                "disallowed_paths": robots.disallowed_paths,
+                "crawl_delay": robots.crawl_delay,
                 "warnings": []
             }
             
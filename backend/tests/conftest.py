@@ -0,0 +1,116 @@
+# backend/tests/conftest.py
+import os
+import threading
+import pytest
+import pytest_asyncio
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+from fastapi.testclient import TestClient
+from httpx import AsyncClient, ASGITransport
+from app.main import app
+
+# Hosts the suite calls out to; answered locally when TESTS_OFFLINE is set
+OFFLINE_HTML_URLS = (
+    "https://httpbin.org/html",
+)
+
+_MOCK_HTML = b"""
+<html>
+    <head><title>Test Page</title></head>
+    <body>
+        <table class="data-table">
+            <tr><th>Name</th><th>Price</th></tr>
+            <tr><td>Product A</td><td>$10</td></tr>
+            <tr><td>Product B</td><td>$20</td></tr>
+        </table>
+    </body>
+</html>
+"""
+
+_PRODUCTS_HTML = b"""
+<html>
+    <head><title>Products</title></head>
+    <body>
+        <table class="products">
+            <tr><th>Name</th><th>Price</th><th>Rating</th></tr>
+            <tr><td>Product A</td><td>$29.99</td><td>4.5</td></tr>
+            <tr><td>Product B</td><td>$39.99</td><td>4.2</td></tr>
+            <tr><td>Product C</td><td>$19.99</td><td>4.8</td></tr>
+        </table>
+    </body>
+</html>
+"""
+
+class _ProductsHandler(BaseHTTPRequestHandler):
+    """Serves the canned product page at /products and 404s everything else"""
+    
+    def do_GET(self):
+        self._respond(send_body=True)
+    
+    def do_HEAD(self):
+        self._respond(send_body=False)
+    
+    def _respond(self, send_body):
+        found = self.path == "/products"
+        body = _PRODUCTS_HTML if found else b""
+        self.send_response(200 if found else 404)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+    
+    def log_message(self, format, *args):
+        pass
+
+def pytest_configure(config):
+    """Register markers used by the suite"""
+    config.addinivalue_line("markers", "slow: marks tests as slow (deselect with '-m \"not slow\"')")
+    config.addinivalue_line("markers", "network: marks tests that call hosts on the public internet, served locally under TESTS_OFFLINE")
+    config.addinivalue_line("markers", "integration: marks tests as integration tests")
+    # Registered here as well so the marks are known when pytest-xdist is not installed
+    config.addinivalue_line("markers", "xdist_group(name): run the marked tests on the same xdist worker")
+
+@pytest.fixture(scope="session")
+def client():
+    """Synchronous test client shared by the whole session"""
+    return TestClient(app)
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def async_client():
+    """In-process client that drives the app on the session event loop"""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        yield ac
+
+@pytest.fixture(scope="session")
+def local_server():
+    """URL of a product page served from a loopback server for the whole session"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _ProductsHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/products"
+    server.shutdown()
+    server.server_close()
+
+@pytest.fixture
+def mock_html_response():
+    """Mock HTML response for testing"""
+    return _MOCK_HTML
+
+@pytest.fixture(autouse=True)
+def offline_http(mock_html_response):
+    """Serve outbound aiohttp traffic from canned pages when TESTS_OFFLINE is set"""
+    if not os.environ.get("TESTS_OFFLINE"):
+        yield None
+        return
+    
+    from aioresponses import aioresponses
+    
+    # Loopback servers stood up by the tests themselves still go through
+    with aioresponses(passthrough=["http://127.0.0.1", "http://localhost"]) as mocked:
+        for url in OFFLINE_HTML_URLS:
+            mocked.get(url, status=200, body=mock_html_response, content_type="text/html", repeat=True)
+            mocked.head(url, status=200, repeat=True)
+            parts = urlsplit(url)
+            mocked.get(f"{parts.scheme}://{parts.netloc}/robots.txt", status=404, repeat=True)
+        yield mocked
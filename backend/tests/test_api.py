@@ -1,66 +1,114 @@
 # backend/tests/test_api.py
 import pytest
 import asyncio
-from httpx import AsyncClient
+import os
+import shutil
+import tempfile
+from fastapi import FastAPI
 from fastapi.testclient import TestClient
 from app.main import app
+from app.core import artifact_index
+from app.core.middleware import UnifiedMiddleware
+from app.api import deps
+from app.api.deps import RateLimiter
 
-# Test client
-client = TestClient(app)
+# Request bodies serialized once instead of on every post
+_HTTPBIN_PAYLOAD = b'{"url": "https://httpbin.org/html"}'
+_JSON_HEADERS = {"content-type": "application/json"}
 
+@pytest.mark.asyncio(loop_scope="session")
 class TestHealthEndpoints:
     """Test health and basic endpoints"""
     
-    def test_root_endpoint(self):
+    async def test_root_endpoint(self, async_client):
         """Test root endpoint"""
-        response = client.get("/")
+        response = await async_client.get("/")
         assert response.status_code == 200
         data = response.json()
         assert "message" in data
         assert "version" in data
     
-    def test_health_endpoint(self):
+    async def test_health_endpoint(self, async_client):
         """Test health check endpoint"""
-        response = client.get("/health")
+        response = await async_client.get("/health")
         assert response.status_code == 200
         data = response.json()
         assert data["status"] == "healthy"
 
-class TestScrapingEndpoints:
-    """Test scraping API endpoints"""
+class TestMiddleware:
+    """Test the request ID, security header and error handling middleware"""
     
-    def test_validate_url_valid(self):
-        """Test URL validation with valid URL"""
-        response = client.post(
-            "/api/v1/validate-url",
-            json={"url": "https://httpbin.org/html"}
-        )
+    def test_security_and_tracing_headers(self, client):
+        """Test every response carries security, request ID and timing headers"""
+        response = client.get("/health")
+        
+        assert response.headers["x-content-type-options"] == "nosniff"
+        assert response.headers["x-frame-options"] == "DENY"
+        assert response.headers["content-security-policy"] == "default-src 'self'"
+        assert float(response.headers["x-process-time"]) >= 0
+        
+        next_response = client.get("/health")
+        assert response.headers["x-request-id"] != next_response.headers["x-request-id"]
+        assert response.headers["x-request-id"].rsplit("-", 1)[0] == next_response.headers["x-request-id"].rsplit("-", 1)[0]
+    
+    def test_docs_exempt_from_csp(self, client):
+        """Test Swagger UI is served without the CSP that would block its CDN assets"""
+        response = client.get("/docs")
+        
         assert response.status_code == 200
-        data = response.json()
-        assert "valid" in data
+        assert "content-security-policy" not in response.headers
+        assert response.headers["x-content-type-options"] == "nosniff"
     
-    def test_validate_url_invalid(self):
-        """Test URL validation with invalid URL"""
-        response = client.post(
-            "/api/v1/validate-url",
-            json={"url": "not-a-valid-url"}
-        )
-        assert response.status_code == 422  # Validation error
+    def test_unhandled_error_returns_json(self):
+        """Test an exception escaping a route becomes a JSON 500"""
+        failing_app = FastAPI()
+        failing_app.add_middleware(UnifiedMiddleware)
+        
+        @failing_app.get("/boom")
+        async def boom():
+            raise RuntimeError("boom")
+        
+        response = TestClient(failing_app, raise_server_exceptions=False).get("/boom")
+        
+        assert response.status_code == 500
+        assert response.json()["type"] == "server_error"
+        assert response.headers["x-error"] == "true"
+        assert "x-request-id" in response.headers
+
+@pytest.mark.asyncio(loop_scope="session")
+class TestScrapingEndpoints:
+    """Test scraping API endpoints"""
+    
+    @pytest.mark.parametrize("body, expected_status", [
+        pytest.param(_HTTPBIN_PAYLOAD, 200, marks=pytest.mark.network),
+        (b'{"url": "not-a-valid-url"}', 422),  # Validation error
+        (b'{}', 422),  # Missing required field
+        (b'invalid json', 422),
+    ], ids=["httpbin", "not-a-url", "missing-url", "malformed-json"])
+    async def test_validate_url(self, async_client, body, expected_status):
+        """Test URL validation across valid and malformed request bodies"""
+        response = await async_client.post("/api/v1/validate-url", content=body, headers=_JSON_HEADERS)
+        assert response.status_code == expected_status
+        if expected_status == 200:
+            assert "valid" in response.json()
     
-    def test_detect_structure(self):
+    @pytest.mark.network
+    async def test_detect_structure(self, async_client):
         """Test structure detection"""
-        response = client.post(
+        response = await async_client.post(
             "/api/v1/detect-structure",
-            json={"url": "https://httpbin.org/html"}
+            content=_HTTPBIN_PAYLOAD,
+            headers=_JSON_HEADERS
         )
         assert response.status_code == 200
         data = response.json()
         assert "success" in data
         assert "strategies" in data
     
-    def test_scrape_endpoint_basic(self):
+    @pytest.mark.network
+    async def test_scrape_endpoint_basic(self, async_client):
         """Test basic scraping functionality"""
-        response = client.post(
+        response = await async_client.post(
             "/api/v1/scrape",
             json={
                 "url": "https://httpbin.org/html",
@@ -74,101 +122,156 @@ class TestScrapingEndpoints:
         assert "success" in data
         assert "scrape_id" in data
 
+@pytest.mark.xdist_group("fs")
+@pytest.mark.asyncio(loop_scope="session")
 class TestFileEndpoints:
     """Test file management endpoints"""
     
-    def test_history_endpoint(self):
+    async def test_history_endpoint(self, async_client):
         """Test scraping history endpoint"""
-        response = client.get("/api/v1/history")
+        response = await async_client.get("/api/v1/history")
         assert response.status_code == 200
         data = response.json()
         assert "history" in data
         assert isinstance(data["history"], list)
     
-    def test_download_nonexistent_file(self):
+    async def test_download_nonexistent_file(self, async_client):
         """Test downloading non-existent file"""
-        response = client.get("/api/v1/download/nonexistent-id/csv")
+        response = await async_client.get("/api/v1/download/nonexistent-id/csv")
         assert response.status_code == 404
     
-    def test_preview_nonexistent_data(self):
+    async def test_preview_nonexistent_data(self, async_client):
         """Test previewing non-existent data"""
-        response = client.get("/api/v1/preview/nonexistent-id")
+        response = await async_client.get("/api/v1/preview/nonexistent-id")
         assert response.status_code == 404
     
-    def test_delete_nonexistent_data(self):
+    async def test_delete_nonexistent_data(self, async_client):
         """Test deleting non-existent data"""
-        response = client.delete("/api/v1/data/nonexistent-id")
+        response = await async_client.delete("/api/v1/data/nonexistent-id")
+        assert response.status_code == 404
+
+class TestStaleArtifacts:
+    """Test file endpoints when files disappear behind the artifact index"""
+    
+    def setup_method(self):
+        """Index a scrape in a temporary directory"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.original_dir = artifact_index.PROCESSED_DIR
+        artifact_index.PROCESSED_DIR = self.temp_dir
+        prefix = os.path.join(self.temp_dir, "scrape_stale_20240101_000000")
+        for suffix, content in ((".csv", "name\nA\n"), (".json", "[]"), ("_metadata.json", "{}"), (".xlsx", "")):
+            with open(prefix + suffix, "w") as f:
+                f.write(content)
+        artifact_index.rebuild()
+    
+    def teardown_method(self):
+        """Restore the real index"""
+        artifact_index.PROCESSED_DIR = self.original_dir
+        artifact_index.rebuild()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def test_preview_deleted_file_is_not_found(self, client):
+        """Test preview returns 404, not 500, once the CSV was removed elsewhere"""
+        os.unlink(artifact_index.get("stale").csv_path)
+        
+        response = client.get("/api/v1/preview/stale")
         assert response.status_code == 404
+    
+    def test_status_deleted_metadata_is_not_found(self, client):
+        """Test status returns 404 once the metadata file was removed elsewhere"""
+        os.unlink(artifact_index.get("stale").metadata_path)
+        
+        response = client.get("/api/v1/scrape/stale/status")
+        assert response.status_code == 404
+    
+    def test_preview_counts_multiline_rows(self, client):
+        """Test the CSV fallback count treats quoted newlines as part of one record"""
+        artifacts = artifact_index.get("stale")
+        os.unlink(artifacts.metadata_path)
+        with open(artifacts.csv_path, "w") as f:
+            f.write('name,description\nA,"line one\nline two"\nB,plain\n')
+        
+        response = client.get("/api/v1/preview/stale")
+        assert response.status_code == 200
+        assert response.json()["total_records"] == 2
+    
+    def test_delete_removes_every_scrape_file(self, client):
+        """Test delete also removes files beyond the CSV/JSON/metadata trio"""
+        response = client.delete("/api/v1/data/stale")
+        
+        assert response.status_code == 200
+        assert len(response.json()["deleted_files"]) == 4
+        assert os.listdir(self.temp_dir) == []
 
 class TestRateLimiting:
     """Test rate limiting functionality"""
     
-    def test_rate_limiting_validation(self):
+    @pytest.mark.network
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_rate_limiting_validation(self, async_client, monkeypatch):
         """Test rate limiting on validation endpoint"""
-        # Make multiple requests rapidly
-        responses = []
-        for i in range(25):  # Exceed the rate limit
-            response = client.post(
-                "/api/v1/validate-url",
-                json={"url": "https://httpbin.org/html"}
-            )
-            responses.append(response.status_code)
+        # Fresh limiter so the burst does not eat into other tests' budget
+        monkeypatch.setattr(deps, "rate_limiter", RateLimiter())
+        
+        # Fire the whole burst at once to exceed the rate limit
+        tasks = [
+            async_client.post("/api/v1/validate-url", content=_HTTPBIN_PAYLOAD, headers=_JSON_HEADERS)
+            for _ in range(25)
+        ]
+        responses = await asyncio.gather(*tasks, return_exceptions=True)
+        
+        # Should get rate limited
+        assert 429 in [r.status_code for r in responses if not isinstance(r, Exception)]
+    
+    def test_rate_limiter_window(self):
+        """Test the limiter denies past max_requests and reaps idle clients"""
+        limiter = RateLimiter(max_clients=2)
+        
+        allowed = [limiter.is_allowed("10.0.0.1", "scraping") for _ in range(11)]
+        assert allowed == [True] * 10 + [False]
         
-        # Should eventually get rate limited
-        assert 429 in responses or 422 in responses  # Rate limited or validation error
+        limiter.is_allowed("10.0.0.2", "scraping")
+        limiter.is_allowed("10.0.0.3", "scraping")
+        assert len(limiter.rings) == 2
+        assert ("10.0.0.1", "scraping") not in limiter.rings
 
+@pytest.mark.asyncio(loop_scope="session")
 class TestErrorHandling:
     """Test error handling"""
     
-    def test_invalid_json(self):
-        """Test handling of invalid JSON"""
-        response = client.post(
-            "/api/v1/validate-url",
-            data="invalid json",
-            headers={"content-type": "application/json"}
-        )
-        assert response.status_code == 422
-    
-    def test_missing_required_fields(self):
-        """Test handling of missing required fields"""
-        response = client.post(
-            "/api/v1/validate-url",
-            json={}
-        )
-        assert response.status_code == 422
-    
-    def test_invalid_file_type(self):
+    async def test_invalid_file_type(self, async_client):
         """Test invalid file type download"""
-        response = client.get("/api/v1/download/test-id/invalid")
+        response = await async_client.get("/api/v1/download/test-id/invalid")
         assert response.status_code == 400
 
-@pytest.mark.asyncio
+@pytest.mark.network
+@pytest.mark.asyncio(loop_scope="session")
 class TestAsyncEndpoints:
     """Test asynchronous functionality"""
     
-    async def test_concurrent_validations(self):
+    async def test_concurrent_validations(self, async_client):
         """Test concurrent URL validations"""
-        async with AsyncClient(app=app, base_url="http://test") as ac:
-            tasks = []
-            for i in range(5):
-                task = ac.post(
-                    "/api/v1/validate-url",
-                    json={"url": "https://httpbin.org/html"}
-                )
-                tasks.append(task)
-            
-            responses = await asyncio.gather(*tasks)
-            
-            # All should succeed or fail gracefully
-            for response in responses:
-                assert response.status_code in [200, 429, 500]
+        tasks = []
+        for i in range(5):
+            task = async_client.post(
+                "/api/v1/validate-url",
+                content=_HTTPBIN_PAYLOAD,
+                headers=_JSON_HEADERS
+            )
+            tasks.append(task)
+        
+        responses = await asyncio.gather(*tasks)
+        
+        # All should succeed or fail gracefully
+        for response in responses:
+            assert response.status_code in [200, 429, 500]
 
 # Fixtures for testing
 @pytest.fixture
-def sample_scrape_data():
-    """Sample scraping data for tests"""
+def sample_scrape_data(local_server):
+    """Sample scraping data for tests, pointed at the local product page"""
     return {
-        "url": "https://example.com/products",
+        "url": local_server,
         "strategy": {
             "type": "table",
             "selector": "table.products"
@@ -186,17 +289,20 @@ def mock_scraped_data():
     ]
 
 # Integration tests
+@pytest.mark.integration
 class TestIntegration:
     """Integration tests for complete workflows"""
     
-    def test_complete_scraping_workflow(self, sample_scrape_data):
+    def test_complete_scraping_workflow(self, client, sample_scrape_data, tmp_path, monkeypatch):
         """Test complete scraping workflow"""
+        # Exports go under data/processed relative to the working directory
+        monkeypatch.chdir(tmp_path)
+        
         # 1. Validate URL
         validation_response = client.post(
             "/api/v1/validate-url",
             json={"url": sample_scrape_data["url"]}
         )
-        # Note: This might fail for external URLs, but we're testing the flow
         
         # 2. Detect structure (if validation passes)
         if validation_response.status_code == 200:
@@ -215,11 +321,13 @@ class TestIntegration:
         
         scrape_data = scrape_response.json()
         assert "scrape_id" in scrape_data
+        assert scrape_data["success"] is True  # The local page always has a products table
         
         # 4. Check status (if scraping initiated)
         if scrape_data.get("success"):
             status_response = client.get(f"/api/v1/scrape/{scrape_data['scrape_id']}/status")
             assert status_response.status_code in [200, 404]
+            artifact_index.discard(scrape_data["scrape_id"])
 
 if __name__ == "__main__":
     pytest.main([__file__])
\ No newline at end of file
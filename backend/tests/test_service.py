@@ -1,13 +1,79 @@
 # backend/tests/test_services.py
 import pytest
+import pytest_asyncio
 import asyncio
+import aiohttp
+import orjson
 import pandas as pd
 import tempfile
 import os
-from unittest.mock import Mock, patch, AsyncMock
-from app.services.scraper import UniversalScraper
+from types import SimpleNamespace
+from unittest.mock import patch
+from app.services.scraper import UniversalScraper, open_shared_connector, close_shared_connector
 from app.services.data_processor import DataProcessor
 from app.services.file_manager import FileManager
+from app.core import artifact_index
+from app.utils import validators
+from app.utils.validators import URLValidator
+
+# Canned pages, kept as bytes so fake responses stream them without re-encoding
+_HTML_PAGE = b"""
+<html>
+    <head><title>Test Page</title></head>
+    <body>
+        <table><tr><td>Data</td></tr></table>
+        <ul><li>Item</li></ul>
+    </body>
+</html>
+"""
+
+_HTML_TABLE_AND_ITEMS = b"""
+<html>
+    <body>
+        <table class="data-table">
+            <tr><th>Name</th><th>Price</th></tr>
+            <tr><td>Product A</td><td>$10</td></tr>
+            <tr><td>Product B</td><td>$20</td></tr>
+        </table>
+        <div class="product-item">Product 1</div>
+        <div class="product-item">Product 2</div>
+        <div class="product-item">Product 3</div>
+        <div class="product-item">Product 4</div>
+    </body>
+</html>
+"""
+
+_HTML_TABLE = b"""
+<table>
+    <tr><th>Name</th><th>Price</th><th>Rating</th></tr>
+    <tr><td>Product A</td><td>$29.99</td><td>4.5</td></tr>
+    <tr><td>Product B</td><td>$39.99</td><td>4.2</td></tr>
+</table>
+"""
+
+class _FakeResponse:
+    """Bare-bones aiohttp response, usable directly as the context manager session.get returns"""
+    charset = "utf-8"
+    
+    def __init__(self, status=200, reason="OK", headers=None, body=b""):
+        self.status = status
+        self.reason = reason
+        self.headers = headers if headers is not None else {}
+        self._body = body if isinstance(body, bytes) else body.encode("utf-8")
+        self.content = SimpleNamespace(iter_chunked=self._iter_chunked)
+    
+    async def text(self):
+        return self._body.decode("utf-8")
+    
+    async def _iter_chunked(self, size):
+        for start in range(0, len(self._body), size):
+            yield self._body[start:start + size]
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        return False
 
 class TestUniversalScraper:
     """Test the UniversalScraper service"""
@@ -20,170 +86,339 @@ class TestUniversalScraper:
         # Session should be closed after context
     
     @pytest.mark.asyncio
-    async def test_validate_url_success(self):
+    async def test_scraper_connector_lifetime(self):
+        """Test scrapers reuse the shared connector when open and otherwise close their own"""
+        async with UniversalScraper() as scraper:
+            private_connector = scraper.session.connector
+        assert private_connector.closed
+        
+        shared_connector = await open_shared_connector()
+        try:
+            async with UniversalScraper() as scraper:
+                assert scraper.session.connector is shared_connector
+            assert not shared_connector.closed
+        finally:
+            await close_shared_connector()
+        assert shared_connector.closed
+    
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_validate_url_success(self, scraper):
         """Test successful URL validation"""
         with patch('aiohttp.ClientSession.get') as mock_get:
             # Mock successful response
-            mock_response = AsyncMock()
-            mock_response.status = 200
-            mock_response.text.return_value = """
-                <html>
-                    <head><title>Test Page</title></head>
-                    <body>
-                        <table><tr><td>Data</td></tr></table>
-                        <ul><li>Item</li></ul>
-                    </body>
-                </html>
-            """
-            mock_get.return_value.__aenter__.return_value = mock_response
+            mock_get.return_value = _FakeResponse(body=_HTML_PAGE)
             
-            async with UniversalScraper() as scraper:
-                result = await scraper.validate_url("https://example.com")
-                
-                assert result["valid"] is True
-                assert result["tables_found"] == 1
-                assert result["lists_found"] == 1
-                assert "Test Page" in result["title"]
+            result = await scraper.validate_url("https://example.com")
+            
+            assert result["valid"] is True
+            assert result["tables_found"] == 1
+            assert result["lists_found"] == 1
+            assert "Test Page" in result["title"]
     
-    @pytest.mark.asyncio
-    async def test_validate_url_failure(self):
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_validate_url_failure(self, scraper):
         """Test URL validation failure"""
         with patch('aiohttp.ClientSession.get') as mock_get:
             # Mock failed response
-            mock_response = AsyncMock()
-            mock_response.status = 404
-            mock_response.reason = "Not Found"
-            mock_get.return_value.__aenter__.return_value = mock_response
+            mock_get.return_value = _FakeResponse(status=404, reason="Not Found")
             
-            async with UniversalScraper() as scraper:
-                result = await scraper.validate_url("https://example.com/404")
-                
-                assert result["valid"] is False
-                assert "404" in result["error"]
+            result = await scraper.validate_url("https://example.com/404")
+            
+            assert result["valid"] is False
+            assert "404" in result["error"]
     
-    @pytest.mark.asyncio
-    async def test_detect_data_structure(self):
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_detect_data_structure(self, scraper):
         """Test data structure detection"""
         with patch('aiohttp.ClientSession.get') as mock_get:
-            mock_response = AsyncMock()
-            mock_response.text.return_value = """
-                <html>
-                    <body>
-                        <table class="data-table">
-                            <tr><th>Name</th><th>Price</th></tr>
-                            <tr><td>Product A</td><td>$10</td></tr>
-                            <tr><td>Product B</td><td>$20</td></tr>
-                        </table>
-                        <div class="product-item">Product 1</div>
-                        <div class="product-item">Product 2</div>
-                        <div class="product-item">Product 3</div>
-                        <div class="product-item">Product 4</div>
-                    </body>
-                </html>
-            """
-            mock_get.return_value.__aenter__.return_value = mock_response
+            mock_get.return_value = _FakeResponse(body=_HTML_TABLE_AND_ITEMS)
             
-            async with UniversalScraper() as scraper:
-                result = await scraper.detect_data_structure("https://example.com")
-                
-                assert result["success"] is True
-                assert len(result["strategies"]) > 0
-                
-                # Should detect table strategy
-                table_strategies = [s for s in result["strategies"] if s["type"] == "table"]
-                assert len(table_strategies) > 0
-                assert table_strategies[0]["estimated_rows"] == 2
+            result = await scraper.detect_data_structure("https://example.com")
+            
+            assert result["success"] is True
+            assert len(result["strategies"]) > 0
+            
+            # Should detect table strategy
+            table_strategies = [s for s in result["strategies"] if s["type"] == "table"]
+            assert len(table_strategies) > 0
+            assert table_strategies[0]["estimated_rows"] == 2
     
-    @pytest.mark.asyncio
-    async def test_scrape_table_data(self):
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_scrape_table_data(self, scraper):
         """Test scraping table data"""
         with patch('aiohttp.ClientSession.get') as mock_get:
-            mock_response = AsyncMock()
-            mock_response.text.return_value = """
+            mock_get.return_value = _FakeResponse(body=_HTML_TABLE)
+            
+            data = await scraper.scrape_table_data("https://example.com")
+            
+            assert len(data) == 2
+            assert data[0]["Name"] == "Product A"
+            assert data[0]["Price"] == "$29.99"
+            assert data[1]["Name"] == "Product B"
+    
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_scrape_table_data_as_columns(self, scraper):
+        """Test columnar table scraping pads short rows and feeds clean_and_process_data"""
+        with patch('aiohttp.ClientSession.get') as mock_get:
+            mock_get.return_value = _FakeResponse(body="""
                 <table>
-                    <tr><th>Name</th><th>Price</th><th>Rating</th></tr>
-                    <tr><td>Product A</td><td>$29.99</td><td>4.5</td></tr>
-                    <tr><td>Product B</td><td>$39.99</td><td>4.2</td></tr>
+                    <tr><th>Name</th><th>Price</th></tr>
+                    <tr><td>Product A</td><td>$29.99</td></tr>
+                    <tr><td><a href="/b">Product B</a></td></tr>
                 </table>
+            """)
+            
+            columns = await scraper.scrape_table_data("https://example.com", as_columns=True)
+            records = await scraper.scrape_table_data("https://example.com")
+        
+        assert columns == {
+            "Name": ["Product A", "Product B"],
+            "Price": ["$29.99", None],
+            "_source_url": [None, "https://example.com/b"]
+        }
+        assert records[1] == {"Name": "Product B", "_source_url": "https://example.com/b"}
+        
+        df = UniversalScraper().clean_and_process_data(columns)
+        assert list(df.columns) == ["Name", "Price", "_source_url"]
+        assert len(df) == 2
+    
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_scrape_table_data_streamed_in_chunks(self, scraper):
+        """Test a body split across many chunks, including mid-character, parses intact"""
+        rows = "".join(f"<tr><td>Prödukt {i}</td></tr>" for i in range(2000))
+        with patch('aiohttp.ClientSession.get') as mock_get, \
+             patch('app.services.scraper._STREAM_CHUNK_SIZE', 7):
+            mock_get.return_value = _FakeResponse(body=f"<table><tr><th>Name</th></tr>{rows}</table>")
+            
+            data = await scraper.scrape_table_data("https://example.com")
+        
+        assert len(data) == 2000
+        assert data[-1]["Name"] == "Prödukt 1999"
+    
+    @pytest.mark.asyncio
+    async def test_scrape_numbered_pagination(self):
+        """Test numbered pages are fetched until the first page without data"""
+        def page(n):
+            return f"""
+                <table><tr><th>Name</th></tr><tr><td>Product {n}</td></tr></table>
+                <a rel="next" href="/list?page={n + 1}">Next</a>
             """
-            mock_get.return_value.__aenter__.return_value = mock_response
+        
+        def fake_get(url, *args, **kwargs):
+            if url == "https://example.com/list":
+                return _FakeResponse(body=page(1))
+            elif url.endswith(("page=2", "page=3")):
+                return _FakeResponse(body=page(int(url[-1])))
+            return _FakeResponse(body="<p>No more results</p>")
+        
+        with patch('aiohttp.ClientSession.get', side_effect=fake_get):
+            async with UniversalScraper(max_pages=20) as scraper:
+                data = await scraper.scrape_with_pagination(
+                    "https://example.com/list", {"type": "table", "selector": "table"}
+                )
+        
+        assert [row["Name"] for row in data] == ["Product 1", "Product 2", "Product 3"]
+    
+    @pytest.mark.asyncio
+    async def test_scrape_numbered_pagination_clamped_pages(self):
+        """Test pagination stops on a site that serves its last page for any ?page past the end"""
+        def page(n):
+            next_link = f'<a rel="next" href="/list?page={n + 1}">Next</a>' if n < 3 else ''
+            return f"<table><tr><th>Name</th></tr><tr><td>Product {n}</td></tr></table>{next_link}"
+        
+        def fake_get(url, *args, **kwargs):
+            requested_page = int(url.rsplit("=", 1)[1]) if "page=" in url else 1
+            return _FakeResponse(body=page(min(requested_page, 3)))
+        
+        with patch('aiohttp.ClientSession.get', side_effect=fake_get):
+            async with UniversalScraper(max_pages=20) as scraper:
+                data = await scraper.scrape_with_pagination(
+                    "https://example.com/list", {"type": "table", "selector": "table"}
+                )
+        
+        assert [row["Name"] for row in data] == ["Product 1", "Product 2", "Product 3"]
+    
+    @pytest.mark.asyncio
+    async def test_scrape_numbered_pagination_wraps_to_first_page(self):
+        """Test pagination stops when an out-of-range page repeats the first page"""
+        def fake_get(url, *args, **kwargs):
+            requested_page = int(url.rsplit("=", 1)[1]) if "page=" in url else 1
+            shown = requested_page if requested_page <= 2 else 1
+            return _FakeResponse(body=f"""
+                <table><tr><th>Name</th></tr><tr><td>Product {shown}</td></tr></table>
+                <a rel="next" href="/list?page={requested_page + 1}">Next</a>
+            """)
+        
+        with patch('aiohttp.ClientSession.get', side_effect=fake_get):
+            async with UniversalScraper(max_pages=20) as scraper:
+                data = await scraper.scrape_with_pagination(
+                    "https://example.com/list", {"type": "table", "selector": "table"}
+                )
+        
+        assert [row["Name"] for row in data] == ["Product 1", "Product 2"]
+    
+    @pytest.mark.asyncio
+    async def test_full_scrape_fetches_first_page_once(self, tmp_path, monkeypatch):
+        """Test validation, detection and extraction share a single fetch of the page"""
+        monkeypatch.chdir(tmp_path)
+        with patch('aiohttp.ClientSession.get') as mock_get:
+            mock_get.return_value = _FakeResponse(body="""
+                <table>
+                    <tr><th>Name</th><th>Price</th></tr>
+                    <tr><td>Product A</td><td>$29.99</td></tr>
+                    <tr><td>Product B</td><td>$39.99</td></tr>
+                </table>
+            """)
             
             async with UniversalScraper() as scraper:
-                data = await scraper.scrape_table_data("https://example.com")
-                
-                assert len(data) == 2
-                assert data[0]["Name"] == "Product A"
-                assert data[0]["Price"] == "$29.99"
-                assert data[1]["Name"] == "Product B"
-    
-    def test_clean_and_process_data(self):
-        """Test data cleaning and processing"""
-        raw_data = [
-            {"name": "  Product A  ", "price": "$29.99", "rating": "4.5"},
-            {"name": "Product B", "price": "$39.99", "rating": "4.2"},
-            {"name": "", "price": "", "rating": ""},  # Empty row
-            {"name": "Product C", "price": "$19.99", "rating": "4.8"}
-        ]
+                result = await scraper.full_scrape("https://example.com")
+        
+        assert result["success"] is True
+        assert result["total_records"] == 2
+        assert mock_get.call_count == 1
+        assert os.path.exists(result["files"]["metadata"])
+        artifact_index.discard(result["scrape_id"])
+    
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_check_reachable_uses_head(self, scraper):
+        """Test the reachability check issues a HEAD and tolerates servers without HEAD"""
+        with patch('aiohttp.ClientSession.head') as mock_head, \
+             patch('aiohttp.ClientSession.get') as mock_get:
+            mock_head.return_value = _FakeResponse(status=405)
+            
+            result = await scraper.check_reachable("https://example.com")
         
+        assert result["valid"] is True
+        assert mock_head.call_count == 1
+        assert mock_get.call_count == 0
+    
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_get_retries_transient_failures(self, scraper):
+        """Test 5xx responses and connection errors are retried with backoff"""
+        outcomes = [aiohttp.ClientConnectionError("reset"), 503, 200]
+        
+        def fake_get(url, *args, **kwargs):
+            outcome = outcomes.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return _FakeResponse(status=outcome, body="<table><tr><th>Name</th></tr><tr><td>A</td></tr></table>")
+        
+        with patch('aiohttp.ClientSession.get', side_effect=fake_get), \
+             patch('app.services.scraper._retry_delay', return_value=0):
+            data = await scraper.scrape_table_data("https://example.com")
+        
+        assert data == [{"Name": "A"}]
+        assert outcomes == []
+    
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_get_gives_up_past_retry_budget(self, scraper):
+        """Test a Retry-After beyond the retry budget returns the error instead of waiting"""
+        with patch('aiohttp.ClientSession.get') as mock_get:
+            mock_get.return_value = _FakeResponse(status=503, reason="Service Unavailable", headers={"Retry-After": "3600"})
+            
+            result = await scraper.validate_url("https://example.com")
+            
+            assert result["valid"] is False
+            assert "503" in result["error"]
+            assert mock_get.call_count == 1
+    
+    @pytest.mark.asyncio
+    async def test_get_releases_host_slot_during_backoff(self):
+        """Test a page backing off doesn't block other fetches to the same host"""
+        requested = []
+        
+        def fake_get(url, *args, **kwargs):
+            status = 503 if requested.count(url) == 0 and url.endswith("/a") else 200
+            requested.append(url)
+            return _FakeResponse(status=status, body="<p>ok</p>")
+        
+        with patch('aiohttp.ClientSession.get', side_effect=fake_get), \
+             patch('app.services.scraper._retry_delay', return_value=0.05), \
+             patch('app.services.scraper._PER_HOST_CONCURRENCY', 1):
+            async with UniversalScraper() as scraper:
+                await asyncio.gather(
+                    scraper._fetch_tree("https://example.com/a"),
+                    scraper._fetch_tree("https://example.com/b")
+                )
+        
+        assert requested == ["https://example.com/a", "https://example.com/b", "https://example.com/a"]
+    
+    def test_clean_and_process_data(self, raw_df):
+        """Test data cleaning and processing"""
         scraper = UniversalScraper()
-        df = scraper.clean_and_process_data(raw_data)
+        df = scraper.clean_and_process_data(raw_df.copy())
         
         assert len(df) == 3  # Empty row should be removed
         assert df.iloc[0]["name"] == "Product A"  # Whitespace trimmed
         assert pd.isna(df.iloc[2]["name"]) or df.iloc[2]["name"] is None  # Empty converted to None
 
+    def test_clean_and_process_data_categorizes_repeated_text(self):
+        """Test low-cardinality text columns become categoricals on large scrapes"""
+        raw_data = [
+            {"name": f"Product {i}", "status": ["In stock", "Sold out"][i % 2], "price": f"${i}.99"}
+            for i in range(2000)
+        ]
+        
+        df = UniversalScraper().clean_and_process_data(raw_data)
+        
+        assert df["status"].dtype == "category"
+        assert df["name"].dtype == object
+        assert df["price"].iloc[3] == 3.99
+        assert df.iloc[1]["status"] == "Sold out"
+
+@pytest.mark.xdist_group("fs")
 class TestDataProcessor:
     """Test the DataProcessor service"""
     
-    def setup_method(self):
-        """Setup test environment"""
-        self.temp_dir = tempfile.mkdtemp()
-        self.processor = DataProcessor(self.temp_dir)
-    
-    def teardown_method(self):
-        """Cleanup test environment"""
-        import shutil
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
-    
-    def test_clean_data(self):
+    def test_clean_data(self, processor, raw_df):
         """Test data cleaning functionality"""
-        raw_data = [
-            {"name": "  Product A  ", "price": "$29.99", "rating": "4.5"},
-            {"name": "Product B", "price": "$39.99", "rating": "4.2"},
-            {"name": "", "price": "", "rating": ""},
-            {"name": "Product C", "price": "$19.99", "rating": "4.8"}
-        ]
-        
-        df = self.processor.clean_data(raw_data)
+        df = processor.clean_data(raw_df.copy())
         
         assert len(df) == 3  # Empty row removed
-        assert "Product A" in df["name"].values
+        assert df["name"].eq("Product A").any()
         # Price should be converted to numeric
         assert df["price"].dtype == "object"  # Might still be object due to $ symbol
     
-    def test_validate_data(self):
+    def test_validate_data(self, processor):
         """Test data validation"""
         df = pd.DataFrame([
             {"name": "Product A", "price": 29.99, "rating": 4.5},
             {"name": "Product B", "price": 39.99, "rating": 4.2}
         ])
         
-        result = self.processor.validate_data(df)
+        result = processor.validate_data(df)
         
         assert result["valid"] is True
         assert result["metrics"]["total_rows"] == 2
         assert result["metrics"]["total_columns"] == 3
         assert result["metrics"]["completeness_percentage"] == 100.0
     
-    def test_save_data(self):
+    def test_validate_data_with_clean_stats(self, processor):
+        """Test validation reuses the stats computed while cleaning"""
+        raw_data = [
+            {"name": "Product A", "price": "29.99"},
+            {"name": "Product A", "price": "29.99"},
+            {"name": "Product B", "price": None}
+        ]
+        
+        df, stats = processor.clean_data(raw_data, return_stats=True)
+        result = processor.validate_data(df, stats=stats)
+        
+        assert stats["duplicates_removed"] == 1
+        assert result["metrics"]["duplicate_rows"] == 0
+        assert result["metrics"]["empty_cells"] == 1
+        assert result["metrics"] == processor.validate_data(df)["metrics"]
+    
+    def test_save_data(self, processor):
         """Test data saving functionality"""
         df = pd.DataFrame([
             {"name": "Product A", "price": 29.99, "rating": 4.5},
             {"name": "Product B", "price": 39.99, "rating": 4.2}
         ])
+        df["listed"] = pd.to_datetime(["2023-01-01 12:30:00", None])
         
         scrape_id = "test-123"
-        files = self.processor.save_data(df, scrape_id, formats=["csv", "json"])
+        files = processor.save_data(df, scrape_id, formats=["csv", "json"])
         
         assert "csv" in files
         assert "json" in files
@@ -191,11 +426,69 @@ class TestDataProcessor:
         assert os.path.exists(files["json"])
         
         # Verify CSV content
-        loaded_df = pd.read_csv(files["csv"])
-        assert len(loaded_df) == 2
-        assert "name" in loaded_df.columns
+        with open(files["csv"]) as f:
+            header = f.readline()
+            rows = sum(1 for _ in f)
+        assert rows == 2
+        assert "name" in header.rstrip("\n").split(",")
+        
+        # Verify JSON content
+        loaded_records = pd.read_json(files["json"], orient="records", convert_dates=False)
+        expected = df.drop(columns="listed").to_dict("records")
+        assert loaded_records.drop(columns="listed").to_dict("records") == expected
+        
+        # Timestamps are written as ISO strings and missing ones as null
+        with open(files["json"], 'rb') as f:
+            raw_records = orjson.loads(f.read())
+        assert raw_records[0]["listed"] == "2023-01-01T12:30:00"
+        assert raw_records[1]["listed"] is None
     
-    def test_save_metadata(self):
+    def test_save_data_csv_format(self, processor):
+        """Test CSV export renders bools and datetimes the way pandas always did"""
+        import csv
+        df = pd.DataFrame({
+            "name": ["Product A", "Product B"],
+            "in_stock": [True, False],
+            "listed": pd.to_datetime(["2023-01-01 12:30:00", None])
+        })
+        
+        files = processor.save_data(df, "test-123", formats=["csv"])
+        
+        with open(files["csv"], newline="") as f:
+            rows = list(csv.reader(f))
+        assert rows == [
+            ["name", "in_stock", "listed"],
+            ["Product A", "True", "2023-01-01 12:30:00"],
+            ["Product B", "False", ""]
+        ]
+    
+    def test_save_data_excel(self, processor):
+        """Test Excel export, including infinite and missing values"""
+        df = pd.DataFrame([
+            {"name": "Product A", "price": 29.99, "ratio": float("inf")},
+            {"name": "Product B", "price": None, "ratio": 0.5}
+        ])
+        
+        files = processor.save_data(df, "test-123", formats=["excel"])
+        
+        loaded_df = pd.read_excel(files["excel"])
+        assert list(loaded_df.columns) == ["name", "price", "ratio"]
+        assert loaded_df["name"].tolist() == ["Product A", "Product B"]
+        assert loaded_df["price"].iloc[0] == 29.99
+        assert pd.isna(loaded_df["price"].iloc[1])
+        assert loaded_df["ratio"].iloc[1] == 0.5
+    
+    def test_save_data_twice_keeps_both(self, processor):
+        """Test back-to-back saves for one scrape don't overwrite each other"""
+        df = pd.DataFrame([{"name": "Product A", "price": 29.99}])
+        
+        first = processor.save_data(df, "test-123", formats=["csv"])
+        second = processor.save_data(df, "test-123", formats=["csv"])
+        
+        assert first["csv"] != second["csv"]
+        assert os.path.exists(first["csv"]) and os.path.exists(second["csv"])
+    
+    def test_save_metadata(self, processor):
         """Test metadata saving"""
         metadata = {
             "scrape_id": "test-123",
@@ -204,104 +497,82 @@ class TestDataProcessor:
             "columns": ["name", "price", "rating"]
         }
         
-        metadata_path = self.processor.save_metadata("test-123", metadata)
+        metadata_path = processor.save_metadata("test-123", metadata)
         
         assert os.path.exists(metadata_path)
         
         # Verify metadata content
-        import json
-        with open(metadata_path, 'r') as f:
-            loaded_metadata = json.load(f)
+        with open(metadata_path, 'rb') as f:
+            loaded_metadata = orjson.loads(f.read())
         
         assert loaded_metadata["scrape_id"] == "test-123"
         assert loaded_metadata["total_records"] == 10
 
+@pytest.mark.xdist_group("fs")
 class TestFileManager:
     """Test the FileManager service"""
     
-    def setup_method(self):
-        """Setup test environment"""
-        self.temp_dir = tempfile.mkdtemp()
-        self.file_manager = FileManager(self.temp_dir)
-    
-    def teardown_method(self):
-        """Cleanup test environment"""
-        import shutil
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
-    
-    def test_find_files_by_scrape_id(self):
+    def test_find_files_by_scrape_id(self, populated_file_manager):
         """Test finding files by scrape ID"""
-        scrape_id = "test-123"
-        timestamp = "20231201_120000"
-        
-        # Create test files
-        test_files = [
-            f"scrape_{scrape_id}_{timestamp}.csv",
-            f"scrape_{scrape_id}_{timestamp}.json", 
-            f"scrape_{scrape_id}_{timestamp}_metadata.json"
-        ]
-        
-        for filename in test_files:
-            file_path = self.file_manager.processed_dir / filename
-            file_path.write_text("test content")
-        
-        files = self.file_manager.find_files_by_scrape_id(scrape_id)
+        files = populated_file_manager.find_files_by_scrape_id("test-123")
         
         assert len(files["csv"]) == 1
         assert len(files["json"]) == 1
         assert len(files["metadata"]) == 1
     
-    def test_get_file_path(self):
-        """Test getting specific file path"""
+    def test_find_files_sees_new_files(self, file_manager):
+        """Test the file index picks up files written after a lookup"""
         scrape_id = "test-123"
         timestamp = "20231201_120000"
         
-        # Create test CSV file
-        csv_filename = f"scrape_{scrape_id}_{timestamp}.csv"
-        csv_path = self.file_manager.processed_dir / csv_filename
+        assert file_manager.find_files_by_scrape_id(scrape_id)["csv"] == []
+        
+        csv_path = file_manager.processed_dir / f"scrape_{scrape_id}_{timestamp}.csv"
         csv_path.write_text("test,data\n1,2")
+        (file_manager.processed_dir / f"scrape_{scrape_id}0_{timestamp}.csv").write_text("other")
         
-        found_path = self.file_manager.get_file_path(scrape_id, "csv")
+        files = file_manager.find_files_by_scrape_id(scrape_id)
+        
+        assert files["csv"] == [str(csv_path)]
+    
+    def test_get_file_path(self, populated_file_manager):
+        """Test getting specific file path"""
+        found_path = populated_file_manager.get_file_path("test-123", "csv")
         
         assert found_path is not None
-        assert csv_filename in found_path
+        assert _SCRAPE_FILES[0] in found_path
     
-    def test_delete_scrape_files(self):
+    def test_delete_scrape_files(self, populated_file_manager):
         """Test deleting scrape files"""
-        scrape_id = "test-123"
-        timestamp = "20231201_120000"
+        deleted_files = populated_file_manager.delete_scrape_files("test-123")
         
-        # Create test files
-        test_files = [
-            f"scrape_{scrape_id}_{timestamp}.csv",
-            f"scrape_{scrape_id}_{timestamp}.json"
-        ]
+        assert len(deleted_files) == len(_SCRAPE_FILES)
+        for filename in _SCRAPE_FILES:
+            file_path = populated_file_manager.processed_dir / filename
+            assert not file_path.exists()
+    
+    def test_list_all_scrapes(self, file_manager):
+        """Test listing scrapes re-reads metadata that has been rewritten"""
+        import json
+        metadata_path = file_manager.processed_dir / "scrape_test-123_20231201_120000_metadata.json"
+        metadata = {"scrape_id": "test-123", "url": "https://example.com", "total_records": 10, "columns": ["a", "b"]}
+        metadata_path.write_text(json.dumps(metadata))
         
-        for filename in test_files:
-            file_path = self.file_manager.processed_dir / filename
-            file_path.write_text("test content")
+        scrapes = file_manager.list_all_scrapes()
         
-        deleted_files = self.file_manager.delete_scrape_files(scrape_id)
+        assert len(scrapes) == 1
+        assert scrapes[0]["total_records"] == 10
+        assert scrapes[0]["columns"] == 2
         
-        assert len(deleted_files) == 2
-        for filename in test_files:
-            file_path = self.file_manager.processed_dir / filename
-            assert not file_path.exists()
+        metadata_path.write_text(json.dumps({**metadata, "total_records": 20}))
+        stat = metadata_path.stat()
+        os.utime(metadata_path, (stat.st_atime, stat.st_mtime + 1))
+        
+        assert file_manager.list_all_scrapes()[0]["total_records"] == 20
     
-    def test_get_storage_stats(self):
+    def test_get_storage_stats(self, populated_file_manager):
         """Test storage statistics"""
-        # Create some test files
-        test_files = [
-            ("test1.csv", "data1,data2\n1,2"),
-            ("test2.json", '{"test": "data"}'),
-            ("test3.txt", "some text data")
-        ]
-        
-        for filename, content in test_files:
-            file_path = self.file_manager.processed_dir / filename
-            file_path.write_text(content)
-        
-        stats = self.file_manager.get_storage_stats()
+        stats = populated_file_manager.get_storage_stats()
         
         assert stats["total_files"] == 3
         assert stats["total_size_bytes"] > 0
@@ -309,23 +580,137 @@ class TestFileManager:
         assert ".json" in stats["file_types"]
         assert stats["total_size_mb"] >= 0
 
-# Mock fixtures for testing
+class TestURLValidator:
+    """Test robots.txt checks"""
+    
+    @pytest.mark.asyncio
+    async def test_robots_fetched_once_per_domain(self):
+        """Test robots.txt is parsed once and reused for every URL on the domain"""
+        validators._robots_cache.clear()
+        with patch('aiohttp.ClientSession.get') as mock_get:
+            mock_get.return_value = _FakeResponse(body="User-agent: *\nDisallow: /private\nCrawl-delay: 2\n")
+            
+            first = await URLValidator.is_scrapable_domain("https://example.com/list?page=1")
+            second = await URLValidator.is_scrapable_domain("https://example.com/private/page")
+        
+        assert mock_get.call_count == 1
+        assert first["allowed"] is True
+        assert second["allowed"] is False
+        assert second["disallowed_paths"] == ["/private"]
+        assert second["crawl_delay"] == 2.0
+
+class TestArtifactIndex:
+    """Test the scrape artifact index"""
+    
+    def setup_method(self):
+        """Point the index at an empty temporary directory"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.original_dir = artifact_index.PROCESSED_DIR
+        artifact_index.PROCESSED_DIR = self.temp_dir
+        artifact_index.rebuild()
+    
+    def teardown_method(self):
+        """Restore the real index"""
+        import shutil
+        artifact_index.PROCESSED_DIR = self.original_dir
+        artifact_index.rebuild()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def _write(self, name, content="{}", mtime=None):
+        path = os.path.join(self.temp_dir, name)
+        with open(path, "w") as f:
+            f.write(content)
+        if mtime is not None:
+            os.utime(path, (mtime, mtime))
+        # Force a directory mtime change even within the filesystem's timestamp granularity
+        stat = os.stat(self.temp_dir)
+        os.utime(self.temp_dir, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        return path
+    
+    def test_rebuild_groups_files_by_scrape_id(self):
+        """Test rebuild picks up every file of a scrape"""
+        csv_path = self._write("scrape_abc_20240101_000000.csv", "a\n1\n")
+        json_path = self._write("scrape_abc_20240101_000000.json", "[]")
+        metadata_path = self._write("scrape_abc_20240101_000000_metadata.json")
+        xlsx_path = self._write("scrape_abc_20240101_000000.xlsx", "")
+        self._write("notes.txt", "ignored")
+        
+        artifact_index.rebuild()
+        artifacts = artifact_index.get("abc")
+        
+        assert artifacts.csv_path == csv_path
+        assert artifacts.json_path == json_path
+        assert artifacts.metadata_path == metadata_path
+        assert sorted(artifacts.paths()) == sorted([csv_path, json_path, metadata_path, xlsx_path])
+    
+    def test_register_and_remove(self):
+        """Test a registered scrape resolves until it is removed"""
+        artifact_index.register("abc", {"csv": "a.csv", "json": "a.json", "metadata": "a_metadata.json"})
+        
+        assert artifact_index.get("abc").paths() == ["a.csv", "a.json", "a_metadata.json"]
+        assert artifact_index.remove("abc").csv_path == "a.csv"
+        assert artifact_index.get("abc") is None
+    
+    def test_miss_refreshes_from_disk(self):
+        """Test a lookup miss rescans when another process wrote new files"""
+        assert artifact_index.get("abc") is None
+        
+        csv_path = self._write("scrape_abc_20240101_000000.csv", "a\n1\n")
+        
+        assert artifact_index.get("abc").csv_path == csv_path
+    
+    def test_history_newest_first(self):
+        """Test history orders scrapes with metadata by modification time"""
+        self._write("scrape_old_20240101_000000_metadata.json", mtime=1_000)
+        self._write("scrape_new_20240102_000000_metadata.json", mtime=3_000)
+        self._write("scrape_mid_20240101_120000_metadata.json", mtime=2_000)
+        self._write("scrape_nometa_20240103_000000.csv", "a\n")
+        
+        history = artifact_index.history(2)
+        
+        assert [os.path.basename(a.metadata_path).split("_")[1] for a in history] == ["new", "mid"]
+
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def scraper():
+    """One scraper and aiohttp session shared by the tests that only mock its requests"""
+    async with UniversalScraper() as s:
+        yield s
+
+@pytest.fixture
+def processor(tmp_path):
+    """DataProcessor writing into a per-test temporary directory"""
+    return DataProcessor(str(tmp_path))
+
 @pytest.fixture
-def mock_html_response():
-    """Mock HTML response for testing"""
-    return """
-    <html>
-        <head><title>Test Page</title></head>
-        <body>
-            <table class="data-table">
-                <tr><th>Name</th><th>Price</th></tr>
-                <tr><td>Product A</td><td>$10</td></tr>
-                <tr><td>Product B</td><td>$20</td></tr>
-            </table>
-        </body>
-    </html>
-    """
+def file_manager(tmp_path):
+    """FileManager over a per-test temporary directory"""
+    return FileManager(str(tmp_path))
 
+@pytest.fixture(scope="session")
+def raw_df():
+    """Scraped rows with padded text, currency prices and an empty row"""
+    return pd.DataFrame([
+        {"name": "  Product A  ", "price": "$29.99", "rating": "4.5"},
+        {"name": "Product B", "price": "$39.99", "rating": "4.2"},
+        {"name": "", "price": "", "rating": ""},  # Empty row
+        {"name": "Product C", "price": "$19.99", "rating": "4.8"}
+    ])
+
+# Files of one scrape, as written by DataProcessor
+_SCRAPE_FILES = (
+    "scrape_test-123_20231201_120000.csv",
+    "scrape_test-123_20231201_120000.json",
+    "scrape_test-123_20231201_120000_metadata.json",
+)
+
+@pytest.fixture
+def populated_file_manager(file_manager):
+    """FileManager whose directory already holds one scrape's files"""
+    for filename in _SCRAPE_FILES:
+        (file_manager.processed_dir / filename).write_bytes(b"x")
+    return file_manager
+
+# Mock fixtures for testing
 @pytest.fixture
 def sample_scraped_data():
     """Sample scraped data for testing"""